@@ -0,0 +1,4 @@
+from core.prerender import register
+
+register('about/author', 'about/author.html', '/about/author/')
+register('about/tech', 'about/tech.html', '/about/tech/')
@@ -1,9 +1,9 @@
-from django.views.generic.base import TemplateView
+from core.views import PrerenderedView
 
 
-class AboutAuthorView(TemplateView):
-    template_name = 'about/author.html'
+class AboutAuthorView(PrerenderedView):
+    page = 'about/author'
 
 
-class AboutTechView(TemplateView):
-    template_name = 'about/tech.html'
+class AboutTechView(PrerenderedView):
+    page = 'about/tech'
@@ -0,0 +1,65 @@
+from django.contrib import admin
+
+from .models import Job, OutgoingEmail
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'name',
+        'status',
+        'progress_display',
+        'created',
+        'finished',
+    )
+    list_filter = ('status',)
+    readonly_fields = (
+        'name',
+        'params',
+        'status',
+        'total',
+        'processed',
+        'error',
+        'created',
+        'started',
+        'finished',
+    )
+
+    def progress_display(self, job):
+        return f'{job.progress}% ({job.processed}/{job.total})'
+    progress_display.short_description = 'Прогресс'
+
+    def has_add_permission(self, request):
+        return False
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'subject',
+        'status',
+        'attempts',
+        'next_attempt',
+        'sent',
+    )
+    list_filter = ('status',)
+    readonly_fields = (
+        'subject',
+        'body',
+        'from_email',
+        'recipients',
+        'extra',
+        'status',
+        'attempts',
+        'next_attempt',
+        'error',
+        'created',
+        'sent',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.register(Job, JobAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
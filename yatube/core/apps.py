@@ -1,5 +1,10 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from . import checks  # noqa: F401
+        autodiscover_modules('jobs', 'fragments', 'pages')
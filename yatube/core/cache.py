@@ -0,0 +1,18 @@
+"""Проверка, что кеш общий для всех процессов.
+
+Счётчики и поколения областей, кеш страниц, сессии, снимки
+пользователей и лимиты частоты верны, только если их записи видят все
+воркеры. У LocMemCache каждый процесс хранит свою копию, и запись в
+одном воркере остальные не видят. На таком кеше эти механизмы
+выключаются, а `manage.py check --deploy` об этом предупреждает.
+"""
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+
+PROCESS_LOCAL_BACKENDS = frozenset({
+    'django.core.cache.backends.locmem.LocMemCache',
+})
+
+
+def is_shared(alias=DEFAULT_CACHE_ALIAS):
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
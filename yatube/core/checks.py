@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+from .cache import is_shared
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if is_shared():
+        return []
+    return [Warning(
+        "Кеш 'default' у каждого процесса свой.",
+        hint=(
+            'Задайте MEMCACHED_LOCATION. Без общего кеша выключены '
+            'механизмы из core.cache: кеш страниц, счётчиков и '
+            'отсутствующих объектов, условные ответы, кешированные сессии '
+            'и лимиты частоты.'
+        ),
+        id='core.W001',
+    )]
+
+
+@register(Tags.caches)
+def check_session_cache(app_configs, **kwargs):
+    engine = settings.SESSION_ENGINE
+    uses_cache = engine in (
+        'django.contrib.sessions.backends.cache',
+        'django.contrib.sessions.backends.cached_db',
+    )
+    if not uses_cache or is_shared(settings.SESSION_CACHE_ALIAS):
+        return []
+    return [Error(
+        'Сессии хранятся в кеше, который у каждого процесса свой.',
+        hint=(
+            'Выход из аккаунта не отзовёт сессию в других воркерах. '
+            'Задайте MEMCACHED_LOCATION или SESSION_ENGINE с базой.'
+        ),
+        id='core.E001',
+    )]
+
+
+@register(Tags.caches, deploy=True)
+def check_rate_limit_cache(app_configs, **kwargs):
+    if is_shared():
+        return []
+    return [Error(
+        'Лимиты попыток входа и частоты запросов требуют общего кеша.',
+        hint=(
+            'В кеше процесса лимит умножается на число воркеров, поэтому '
+            'лимиты выключены. Задайте MEMCACHED_LOCATION.'
+        ),
+        id='core.E002',
+    )]
+
+
+@register(Tags.security, deploy=True)
+def check_rate_limit_ip_header(app_configs, **kwargs):
+    if settings.RATELIMIT_RATE is None or settings.RATELIMIT_IP_HEADER:
+        return []
+    return [Warning(
+        'Лимит частоты запросов считается по REMOTE_ADDR.',
+        hint=(
+            'За прокси у всех запросов адрес прокси, и клиенты делят одну '
+            'корзину. Задайте RATELIMIT_IP_HEADER - заголовок, который '
+            'прокси перезаписывает, - или RATELIMIT_RATE = None.'
+        ),
+        id='core.W002',
+    )]
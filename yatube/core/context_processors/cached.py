@@ -0,0 +1,36 @@
+"""Основа для дешёвых контекст-процессоров.
+
+Контекст-процессоры выполняются при каждом рендере с RequestContext,
+в том числе на статичных страницах. Значения, не зависящие от запроса,
+вычисляются здесь раз в процесс или раз в интервал (@process_cached).
+"""
+import time
+from functools import wraps
+from threading import Lock
+
+
+def process_cached(interval=None):
+    """Кеширует результат func() на процесс, с interval - на interval
+    секунд. Декорированная функция вызывается без запроса."""
+    def decorator(func):
+        state = {'value': None, 'expires': 0.0}
+        lock = Lock()
+
+        @wraps(func)
+        def processor(request):
+            now = time.monotonic()
+            if state['value'] is None or (
+                interval is not None and now >= state['expires']
+            ):
+                with lock:
+                    state['value'] = func()
+                    if interval is not None:
+                        state['expires'] = now + interval
+            return state['value']
+
+        def cache_clear():
+            state['value'] = None
+
+        processor.cache_clear = cache_clear
+        return processor
+    return decorator
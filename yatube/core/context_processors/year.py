@@ -1,5 +1,8 @@
 from datetime import datetime
 
+from .cached import process_cached
 
-def year(request):
+
+@process_cached(interval=60)
+def year():
     return {'year': datetime.today().year}
@@ -0,0 +1,157 @@
+from calendar import timegm
+from functools import wraps
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.cache import cache_page
+
+from .cache import is_shared
+from .fragments import esi_enabled, fill_fragments
+
+
+def conditional_page(validators_func, shared=False):
+    """Условный GET по ETag и Last-Modified.
+
+    В отличие от django.views.decorators.http.condition оба валидатора
+    вычисляются одним вызовом validators_func(request, *args, **kwargs),
+    который возвращает пару (etag, last_modified). Страницы зависят от
+    пользователя, поэтому ответ варьируется по Cookie. Исключение -
+    страницы с shared=True при включённых EDGE_SIDE_INCLUDES: их тело
+    одинаково для всех, а личные фрагменты собирает edge-кеш.
+    Валидаторы строятся из поколений в кеше, поэтому без общего кеша
+    (core.cache) условные ответы выключены.
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or not is_shared():
+                return view(request, *args, **kwargs)
+            etag, last_modified = validators_func(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag is not None else None
+            if last_modified is not None:
+                last_modified = timegm(last_modified.utctimetuple())
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+            if last_modified and not response.has_header('Last-Modified'):
+                response['Last-Modified'] = http_date(last_modified)
+            if etag:
+                response.setdefault('ETag', etag)
+            if not (shared and esi_enabled()):
+                patch_vary_headers(response, ('Cookie', ))
+            return response
+        return inner
+    return decorator
+
+
+def _patch_split_headers(response, shared, timeout):
+    if not shared:
+        patch_cache_control(response, private=True, max_age=0)
+    elif esi_enabled():
+        patch_cache_control(response, public=True, s_maxage=timeout)
+        response['Surrogate-Control'] = 'content="ESI/1.0"'
+    else:
+        patch_cache_control(response, public=True, max_age=timeout)
+    return response
+
+
+def _cached_page(page_key, timeout):
+    """Готовая страница для анонимов или ESI из кеша, или None."""
+    content = cache.get(page_key)
+    if content is None:
+        return None
+    return _patch_split_headers(HttpResponse(content), True, timeout)
+
+
+def _render_body(view, request, args, kwargs, body_key, timeout):
+    """Тело страницы с маркерами из кеша или от view.
+
+    Возвращает пару (ответ, тело). Ответ с кодом не 200 уже заполнен
+    фрагментами и не кешируется, тело для него - None.
+    """
+    body = cache.get(body_key)
+    if body is not None:
+        return HttpResponse(), body
+    request.defer_fragments = True
+    try:
+        response = view(request, *args, **kwargs)
+    finally:
+        request.defer_fragments = False
+    body = response.content.decode(response.charset)
+    if response.status_code != 200:
+        response.content = fill_fragments(request, body)
+        return response, None
+    cache.set(body_key, body, timeout)
+    return response, body
+
+
+def _process_local_view(view, timeout):
+    """View без общего кеша: гостям - cache_page(timeout), если он задан."""
+    if timeout is None:
+        return view
+    cached_view = cache_page(timeout)(view)
+
+    def inner(request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        return cached_view(request, *args, **kwargs)
+    return inner
+
+
+def split_cache_page(key_func, timeout=None, local_timeout=None):
+    """Кеш страницы, общий для всех пользователей.
+
+    Тело страницы рендерится один раз: вместо фрагментов, зависящих от
+    пользователя (core.fragments), в нём остаются маркеры. Ключ кеша
+    возвращает key_func(request, *args, **kwargs); он должен меняться
+    вместе с данными страницы. На каждый запрос в тело подставляются
+    фрагменты текущего пользователя, а при EDGE_SIDE_INCLUDES - теги
+    <esi:include>. Для анонимов и ESI готовая страница тоже кешируется.
+    Если key_func вернула None или кеш не общий (core.cache), страница
+    рендерится без кеша. Для страниц, которым можно устареть на
+    local_timeout секунд, без общего кеша анонимам отдаётся целая
+    страница из кеша процесса, как с cache_page(local_timeout).
+    """
+    def decorator(view):
+        local_view = _process_local_view(view, local_timeout)
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if not is_shared():
+                return local_view(request, *args, **kwargs)
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            key = key_func(request, *args, **kwargs)
+            if key is None:
+                return view(request, *args, **kwargs)
+            page_timeout = (
+                settings.SPLIT_CACHE_TIMEOUT if timeout is None else timeout
+            )
+            esi = esi_enabled()
+            shared = esi or not request.user.is_authenticated
+            body_key = f'split_page:{md5(key.encode()).hexdigest()}'
+            page_key = f'{body_key}:{"esi" if esi else "anon"}'
+            if shared:
+                response = _cached_page(page_key, page_timeout)
+                if response is not None:
+                    return response
+            response, body = _render_body(
+                view, request, args, kwargs, body_key, page_timeout
+            )
+            if body is None:
+                return response
+            content = fill_fragments(request, body)
+            if shared:
+                cache.set(page_key, content, page_timeout)
+            response.content = content
+            return _patch_split_headers(response, shared, page_timeout)
+        return inner
+    return decorator
@@ -0,0 +1,114 @@
+"""Фрагменты страницы, зависящие от пользователя.
+
+Фрагмент - шаблон с функцией контекста, которая получает request и
+строковые параметры. В обычном режиме тег {% fragment %} рендерит его
+на месте. Когда страница рендерится для общего кеша
+(request.defer_fragments), на месте фрагмента остаётся маркер, который
+затем заменяется отрисованным фрагментом для конкретного пользователя
+или тегом <esi:include> для edge-кеша.
+
+Параметры приходят и из адреса /fragments/<name>/, а контекст фрагмента
+перекрывает контекст-процессоры. Поэтому функция контекста обязательна:
+она принимает только известные параметры и проверяет их значения.
+Лишний или неверный параметр даёт TypeError или ValueError, и view
+фрагмента отвечает 404.
+"""
+import re
+from urllib.parse import urlencode, parse_qsl
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.html import escape
+
+MARKER = '<!--fragment:{name}?{query}-->'
+MARKER_RE = re.compile(r'<!--fragment:(?P<name>[\w-]+)\?(?P<query>[^>]*?)-->')
+
+_registry = {}
+
+
+class Fragment:
+    def __init__(self, template_name, context_func):
+        self.template_name = template_name
+        self.context_func = context_func
+
+    def get_context(self, request, params):
+        return self.context_func(request, **params)
+
+
+def register(name, template_name, context_func):
+    _registry[name] = Fragment(template_name, context_func)
+
+
+def get_fragment(name):
+    return _registry.get(name)
+
+
+def esi_enabled():
+    return getattr(settings, 'EDGE_SIDE_INCLUDES', False)
+
+
+def marker(name, params):
+    return MARKER.format(name=name, query=urlencode(params))
+
+
+def render_fragment(request, name, params):
+    fragment = get_fragment(name)
+    return render_to_string(
+        fragment.template_name,
+        fragment.get_context(request, params),
+        request,
+    )
+
+
+def esi_include(name, query):
+    src = reverse('core:fragment', args=(name, ))
+    if query:
+        src = f'{src}?{query}'
+    return f'<esi:include src="{escape(src)}"/>'
+
+
+def fill_fragments(request, content, esi=None, skip=()):
+    """Заменяет маркеры фрагментов в HTML готовой разметкой.
+
+    Маркеры фрагментов из skip остаются на месте.
+    """
+    if esi is None:
+        esi = esi_enabled()
+
+    def replace(match):
+        if match['name'] in skip:
+            return match[0]
+        if esi:
+            return esi_include(match['name'], match['query'])
+        return render_fragment(
+            request, match['name'], dict(parse_qsl(match['query']))
+        )
+
+    return MARKER_RE.sub(replace, content)
+
+
+# Пункты шапки, которые подсвечиваются на своей странице.
+HEADER_VIEW_NAMES = frozenset({
+    'about:author',
+    'about:tech',
+    'posts:post_create',
+    'users:password_reset_form',
+    'users:logout',
+    'users:login',
+    'users:signup',
+})
+
+
+def header_context(request, view_name=''):
+    return {'view_name': view_name if view_name in HEADER_VIEW_NAMES else ''}
+
+
+def request_path_context(request):
+    return {'path': request.path}
+
+
+register('header', 'includes/header.html', header_context)
+register(
+    'request_path', 'core/includes/request_path.html', request_path_context
+)
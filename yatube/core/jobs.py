@@ -0,0 +1,64 @@
+import json
+import traceback
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+
+DEFAULT_CHUNK_SIZE = 1000
+
+_registry = {}
+
+
+def job(name):
+    """Регистрирует функцию ``func(job, **params)`` как фоновую задачу."""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def chunked(items, size=None):
+    size = size or getattr(settings, 'JOBS_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def enqueue(name, **params):
+    if name not in _registry:
+        raise KeyError(f'Неизвестная фоновая задача: {name}')
+    new_job = Job.objects.create(name=name, params=json.dumps(params))
+    if getattr(settings, 'JOBS_ALWAYS_EAGER', False):
+        run_job(new_job)
+    return new_job
+
+
+def run_job(current):
+    claimed = Job.objects.filter(
+        pk=current.pk, status=Job.PENDING
+    ).update(status=Job.RUNNING, started=timezone.now())
+    if not claimed:
+        return current
+    current.status = Job.RUNNING
+    try:
+        _registry[current.name](current, **current.get_params())
+    except Exception:
+        current.status = Job.FAILED
+        current.error = traceback.format_exc()
+    else:
+        current.status = Job.DONE
+    current.finished = timezone.now()
+    Job.objects.filter(pk=current.pk).update(
+        status=current.status,
+        error=current.error,
+        finished=current.finished,
+    )
+    return current
+
+
+def run_pending(limit=None):
+    pending = Job.objects.filter(status=Job.PENDING).order_by('created')
+    if limit:
+        pending = pending[:limit]
+    return [run_job(current) for current in pending]
@@ -0,0 +1,161 @@
+"""Очередь исходящих писем.
+
+С EMAIL_BACKEND = 'core.mail.OutboxBackend' письма сохраняются в таблицу
+OutgoingEmail, и запрос не ждёт почтового сервера. Команда send_outbox
+забирает созревшие письма пачками и отправляет каждую пачку через
+EMAIL_OUTBOX_BACKEND по одному соединению. Письмо, которое не удалось
+отправить, откладывается с удваивающейся паузой, а после
+EMAIL_OUTBOX_MAX_ATTEMPTS попыток помечается ошибочным.
+
+Обработчик рассчитан на один процесс: письма не захватываются
+блокировкой, и два обработчика могут отправить одно письмо дважды.
+"""
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+DEFAULT_BATCH_SIZE = 50
+UPDATE_FIELDS = ('status', 'attempts', 'next_attempt', 'error', 'sent')
+
+
+def delivery_backend():
+    return getattr(
+        settings, 'EMAIL_OUTBOX_BACKEND',
+        'django.core.mail.backends.smtp.EmailBackend',
+    )
+
+
+def to_outgoing(message, now):
+    return OutgoingEmail(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        recipients=json.dumps({
+            'to': list(message.to),
+            'cc': list(message.cc),
+            'bcc': list(message.bcc),
+            'reply_to': list(message.reply_to),
+        }),
+        extra=json.dumps({
+            'headers': message.extra_headers,
+            'alternatives': list(getattr(message, 'alternatives', [])),
+            'content_subtype': message.content_subtype,
+        }),
+        next_attempt=now,
+    )
+
+
+def to_message(email, connection):
+    extra = json.loads(email.extra)
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        headers=extra['headers'],
+        alternatives=[tuple(item) for item in extra['alternatives']],
+        connection=connection,
+        **json.loads(email.recipients),
+    )
+    message.content_subtype = extra['content_subtype']
+    return message
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Ставит письма в очередь вместо отправки.
+
+    Письма с вложениями отправляются сразу: вложения в очередь
+    не сохраняются.
+    """
+
+    def send_messages(self, email_messages):
+        queued, direct = [], []
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            if message.attachments:
+                direct.append(message)
+            else:
+                queued.append(message)
+        now = timezone.now()
+        OutgoingEmail.objects.bulk_create(
+            to_outgoing(message, now) for message in queued
+        )
+        sent = len(queued)
+        if direct:
+            connection = get_connection(
+                delivery_backend(), fail_silently=self.fail_silently
+            )
+            sent += connection.send_messages(direct) or 0
+        return sent
+
+
+def retry_delay(attempts):
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_DELAY', 60)
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+def mark_failed(email, exc, now):
+    email.attempts += 1
+    email.error = f'{type(exc).__name__}: {exc}'
+    if email.attempts >= getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5):
+        email.status = OutgoingEmail.FAILED
+    else:
+        email.next_attempt = now + retry_delay(email.attempts)
+
+
+def deliver(batch_size=None):
+    """Отправляет одну пачку писем, возвращает (отправлено, с ошибкой)."""
+    batch_size = batch_size or getattr(
+        settings, 'EMAIL_OUTBOX_BATCH_SIZE', DEFAULT_BATCH_SIZE
+    )
+    now = timezone.now()
+    emails = list(
+        OutgoingEmail.objects.filter(
+            status=OutgoingEmail.PENDING, next_attempt__lte=now
+        ).order_by('next_attempt', 'pk')[:batch_size]
+    )
+    if not emails:
+        return 0, 0
+    sent = failed = 0
+    connection = get_connection(delivery_backend())
+    try:
+        connection.open()
+    except Exception as exc:
+        for email in emails:
+            mark_failed(email, exc, now)
+        failed = len(emails)
+    else:
+        try:
+            for email in emails:
+                try:
+                    connection.send_messages([to_message(email, connection)])
+                except Exception as exc:
+                    mark_failed(email, exc, now)
+                    failed += 1
+                else:
+                    email.status = OutgoingEmail.SENT
+                    email.attempts += 1
+                    email.error = ''
+                    email.sent = timezone.now()
+                    sent += 1
+        finally:
+            connection.close()
+    OutgoingEmail.objects.bulk_update(emails, UPDATE_FIELDS)
+    return sent, failed
+
+
+def deliver_pending(batch_size=None):
+    """Отправляет пачки, пока в очереди есть созревшие письма."""
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = deliver(batch_size)
+        total_sent += sent
+        total_failed += failed
+        if not sent and not failed:
+            return total_sent, total_failed
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core import prerender
+
+
+class Command(BaseCommand):
+    help = 'Рендерит страницы без данных из базы в PRERENDER_ROOT'
+
+    def handle(self, *args, **options):
+        for name in prerender.pages():
+            filename, size = prerender.build(name)
+            self.stdout.write(f'{name}: {size} байт -> {filename}')
@@ -0,0 +1,64 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.test import RequestFactory
+from django.urls import Resolver404, resolve
+
+DEFAULT_PATHS = ('/', '/about/author/', '/about/tech/')
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время контекст-процессоров для страниц'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+        parser.add_argument('--iterations', type=int, default=2000)
+        parser.add_argument(
+            '--username', help='Строить контекст для этого пользователя',
+        )
+        parser.add_argument(
+            '--touch', action='store_true',
+            help='Обращаться к каждому значению, как это делает шаблон',
+        )
+
+    def handle(self, *args, **options):
+        user = AnonymousUser()
+        if options['username']:
+            user = get_user_model().objects.get(username=options['username'])
+        processors = engines['django'].engine.template_context_processors
+        factory = RequestFactory()
+        self.stdout.write(f'{"страница / процессор":<56}{"мкс":>10}')
+        for path in options['paths']:
+            try:
+                match = resolve(path)
+            except Resolver404:
+                raise CommandError(f'Адрес не найден: {path}')
+            request = factory.get(path)
+            request.user = user
+            request.resolver_match = match
+            total = 0.0
+            rows = []
+            for processor in processors:
+                spent = self.measure(
+                    processor, request, options['iterations'],
+                    options['touch'],
+                )
+                total += spent
+                rows.append((
+                    f'{processor.__module__}.{processor.__name__}', spent
+                ))
+            self.stdout.write(f'{match.view_name:<56}{total:>10.2f}')
+            for name, spent in rows:
+                self.stdout.write(f'  {name:<54}{spent:>10.2f}')
+
+    def measure(self, processor, request, iterations, touch):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            context = processor(request)
+            if touch:
+                for value in context.values():
+                    str(value)
+        return (time.perf_counter() - start) / iterations * 1e6
@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Выполняется в отдельном интерпретаторе с -X importtime, чтобы замерить
+# холодный запуск, а не уже настроенный процесс команды.
+STARTUP_SCRIPT = '''
+import json, time
+start = time.perf_counter()
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+phases = [('settings', time.perf_counter() - start, None)]
+start = time.perf_counter()
+django.setup()
+phases.append(('apps', time.perf_counter() - start, None))
+from core.startup import warm_up
+phases.extend(warm_up())
+print(json.dumps(phases))
+'''
+
+
+def parse_importtime(output):
+    """Строки -X importtime: (модуль, собственное время, с вложенными), мкс."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(own), int(cumulative)))
+    return modules
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время импорта модулей и фаз запуска Django'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=20,
+            help='Сколько самых медленных модулей показать',
+        )
+        parser.add_argument(
+            '--sort', choices=('cumulative', 'self'), default='cumulative',
+            help='Сортировать по времени с вложенными импортами или без',
+        )
+
+    def handle(self, *args, **options):
+        env = dict(os.environ)
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr[-2000:])
+        phases = json.loads(result.stdout.strip().splitlines()[-1])
+        self.stdout.write(f'{"фаза":<12}{"мс":>10}{"объектов":>10}')
+        for name, seconds, count in phases:
+            self.stdout.write(
+                f'{name:<12}{seconds * 1000:>10.1f}'
+                f'{"" if count is None else count:>10}'
+            )
+        modules = parse_importtime(result.stderr)
+        column = 1 if options['sort'] == 'self' else 2
+        modules.sort(key=lambda module: module[column], reverse=True)
+        self.stdout.write(
+            f'\n{"модуль":<50}{"своё, мс":>10}{"всего, мс":>11}'
+        )
+        for name, own, cumulative in modules[:options['top']]:
+            self.stdout.write(
+                f'{name:<50}{own / 1000:>10.1f}{cumulative / 1000:>11.1f}'
+            )
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Локальный обработчик очереди фоновых задач'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать очередь один раз и выйти',
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=2.0,
+            help='Пауза между опросами очереди, секунд',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            for job in run_pending():
+                self.stdout.write(f'{job}: {job.get_status_display()}')
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.mail import deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Локальный обработчик очереди исходящих писем'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить созревшие письма один раз и выйти',
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=5.0,
+            help='Пауза между опросами очереди, секунд',
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Писем на одно соединение с почтовым сервером',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_pending(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, с ошибкой: {failed}'
+                )
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
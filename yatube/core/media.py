@@ -0,0 +1,104 @@
+"""Отдача загруженных файлов из MEDIA_ROOT.
+
+Проверки доступа выполняются в Python (register_access_check), а сами
+байты по возможности отдаёт веб-сервер: при MEDIA_SENDFILE = 'x-accel'
+nginx получает заголовок X-Accel-Redirect, при 'x-sendfile' Apache или
+lighttpd - X-Sendfile. Без этой настройки файл возвращается через
+FileResponse, а WSGI-сервер отправляет его через wsgi.file_wrapper,
+то есть sendfile(). Для диапазонов сервер получает файл, сдвинутый на
+начало диапазона, и Content-Length его длины.
+"""
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+
+RANGE_RE = re.compile(r'^bytes=(?P<start>\d*)-(?P<end>\d*)$')
+
+_access_checks = []
+
+
+def register_access_check(prefix, check):
+    """Регистрирует check(request, path) для файлов с путём на prefix.
+
+    Если проверка вернула False, файл отдаётся как несуществующий.
+    """
+    _access_checks.append((prefix, check))
+
+
+def has_access(request, path):
+    return all(
+        check(request, path)
+        for prefix, check in _access_checks
+        if path.startswith(prefix)
+    )
+
+
+def is_restricted(path):
+    return any(path.startswith(prefix) for prefix, _ in _access_checks)
+
+
+def parse_range(header, size):
+    """(start, end) включительно для одного диапазона.
+
+    None - заголовка нет или диапазонов несколько: отдаём файл целиком.
+    ValueError - диапазон не пересекается с файлом.
+    """
+    match = RANGE_RE.match(header.replace(' ', '')) if header else None
+    if match is None:
+        return None
+    start, end = match['start'], match['end']
+    if not start and not end:
+        return None
+    if not start:
+        # bytes=-N - последние N байт.
+        length = int(end)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+class RangeFile:
+    """Файл, из которого можно прочитать не больше length байт.
+
+    fileno() и tell() остаются у исходного файла, поэтому wsgi.file_wrapper
+    с sendfile() отправляет данные с текущей позиции без копирования,
+    ограничиваясь Content-Length.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def sendfile_headers(path, filename):
+    """Заголовки для отдачи файла веб-сервером или None."""
+    backend = getattr(settings, 'MEDIA_SENDFILE', None)
+    if backend == 'x-accel':
+        location = settings.MEDIA_ACCEL_PREFIX + quote(path)
+        return {'X-Accel-Redirect': location}
+    if backend == 'x-sendfile':
+        return {'X-Sendfile': filename}
+    return None
@@ -0,0 +1,101 @@
+"""Дешёвые отказы до обработки запроса: 503 и 429.
+
+LoadSheddingMiddleware сбрасывает нагрузку ответом 503.
+
+Запрос отклоняется, если процесс уже обрабатывает
+LOAD_SHEDDING_MAX_IN_FLIGHT запросов или если запрос ждал в очереди
+перед Django дольше LOAD_SHEDDING_MAX_QUEUE_TIME секунд. Время ожидания
+считается по заголовку, который ставит прокси, например для nginx
+`proxy_set_header X-Request-Start "t=${msec}";`. Прокси должен
+перезаписывать этот заголовок. Страница 503 берётся из core.prerender
+и не обращается ни к сессии, ни к базе.
+
+RateLimitMiddleware ограничивает частоту запросов с одного IP корзиной
+токенов в общем кеше (core.ratelimit.take) и отвечает 429. Без общего
+кеша ограничение не действует (core.ratelimit.enabled). За прокси
+адрес клиента берётся из RATELIMIT_IP_HEADER, иначе все запросы
+приходят с адреса прокси и делят одну корзину.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from . import prerender, ratelimit
+
+
+def queue_time(request, header):
+    """Секунд с момента, записанного прокси в заголовок, или None."""
+    value = request.META.get(header, '').strip()
+    if value.startswith('t='):
+        value = value[len('t='):]
+    try:
+        started = float(value)
+    except ValueError:
+        return None
+    # Прокси пишут секунды, миллисекунды или микросекунды с начала эпохи.
+    while started > 1e11:
+        started /= 1000
+    return time.time() - started
+
+
+class LoadSheddingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if self.queued_too_long(request) or not self.admit():
+            return self.shed(request)
+        try:
+            return self.get_response(request)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def admit(self):
+        limit = settings.LOAD_SHEDDING_MAX_IN_FLIGHT
+        with self.lock:
+            if limit is not None and self.in_flight >= limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def queued_too_long(self, request):
+        limit = settings.LOAD_SHEDDING_MAX_QUEUE_TIME
+        if limit is None:
+            return False
+        waited = queue_time(request, settings.LOAD_SHEDDING_QUEUE_HEADER)
+        return waited is not None and waited > limit
+
+    def shed(self, request):
+        response = prerender.response(request, '503', status=503)
+        response['Retry-After'] = str(settings.LOAD_SHEDDING_RETRY_AFTER)
+        return response
+
+
+class RateLimitMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Статику и медиа в продакшене отдаёт прокси, их не считаем.
+        self.exempt = tuple(
+            url for url in (settings.STATIC_URL, settings.MEDIA_URL) if url
+        )
+
+    def __call__(self, request):
+        rate = settings.RATELIMIT_RATE
+        if (
+            rate is None
+            or not ratelimit.enabled()
+            or request.path.startswith(self.exempt)
+        ):
+            return self.get_response(request)
+        key = ratelimit.make_key('request', ratelimit.client_ip(request))
+        wait = ratelimit.take(key, rate, settings.RATELIMIT_BURST)
+        if wait:
+            response = prerender.response(request, '429', status=429)
+            response['Retry-After'] = str(math.ceil(wait))
+            return response
+        return self.get_response(request)
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28 on 2026-10-19 17:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Задача')),
+                ('params', models.TextField(default='{}', verbose_name='Параметры')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Завершена'), ('failed', 'Ошибка')], db_index=True, default='pending', max_length=10, verbose_name='Статус')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Всего объектов')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Обработано')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Создана')),
+                ('started', models.DateTimeField(blank=True, null=True, verbose_name='Начата')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Завершена')),
+            ],
+            options={
+                'verbose_name': 'Фоновая задача',
+                'verbose_name_plural': 'Фоновые задачи',
+                'ordering': ('-created',),
+            },
+        ),
+    ]
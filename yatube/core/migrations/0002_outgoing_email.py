@@ -0,0 +1,36 @@
+# Generated by Django 2.2.28 on 2026-10-19 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.TextField(verbose_name='Тема')),
+                ('body', models.TextField(verbose_name='Текст')),
+                ('from_email', models.CharField(max_length=254, verbose_name='Отправитель')),
+                ('recipients', models.TextField(verbose_name='Адресаты')),
+                ('extra', models.TextField(default='{}', verbose_name='Заголовки и вложения')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('sent', 'Отправлено'), ('failed', 'Ошибка')], default='pending', max_length=10, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('next_attempt', models.DateTimeField(verbose_name='Следующая попытка')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('sent', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено')),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+                'ordering': ('-created',),
+                'index_together': {('status', 'next_attempt')},
+            },
+        ),
+    ]
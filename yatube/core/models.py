@@ -0,0 +1,95 @@
+import json
+
+from django.db import models
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Завершена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField('Задача', max_length=100)
+    params = models.TextField('Параметры', default='{}')
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        db_index=True,
+    )
+    total = models.PositiveIntegerField('Всего объектов', default=0)
+    processed = models.PositiveIntegerField('Обработано', default=0)
+    error = models.TextField('Ошибка', blank=True)
+    created = models.DateTimeField('Создана', auto_now_add=True)
+    started = models.DateTimeField('Начата', null=True, blank=True)
+    finished = models.DateTimeField('Завершена', null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created', )
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
+
+    def get_params(self):
+        return json.loads(self.params)
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 100 if self.status == self.DONE else 0
+        return min(100, self.processed * 100 // self.total)
+
+    def set_total(self, total):
+        self.total = total
+        Job.objects.filter(pk=self.pk).update(total=total)
+
+    def advance(self, count):
+        self.processed += count
+        Job.objects.filter(pk=self.pk).update(processed=self.processed)
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    subject = models.TextField('Тема')
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    # Адресаты, заголовки и альтернативные версии письма хранятся в JSON.
+    recipients = models.TextField('Адресаты')
+    extra = models.TextField('Заголовки и вложения', default='{}')
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    next_attempt = models.DateTimeField('Следующая попытка')
+    error = models.TextField('Ошибка', blank=True)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    sent = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created', )
+        index_together = [['status', 'next_attempt']]
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.subject} #{self.pk}'
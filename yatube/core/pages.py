@@ -0,0 +1,10 @@
+from .prerender import STATIC, register
+
+# Страницы ошибок не обращаются к пользователю и базе: при всплеске
+# ошибок или потоке 404 от краулеров они стоят одной подстановки.
+register('403', 'core/403.html', mode=STATIC)
+register('403csrf', 'core/403csrf.html', mode=STATIC)
+register('404', 'core/404.html', mode=STATIC)
+register('429', 'core/429.html', mode=STATIC)
+register('500', 'core/500.html', mode=STATIC)
+register('503', 'core/503.html', mode=STATIC)
@@ -0,0 +1,184 @@
+"""Страницы, отрендеренные заранее.
+
+Страницы без данных из базы (about, страницы ошибок) рендерятся
+командой prerender_pages в PRERENDER_ROOT. Шапка и другие фрагменты,
+зависящие от запроса, остаются в них маркерами core.fragments и
+заполняются при отдаче. Готовая страница для анонимных пользователей
+и её gzip-версия хранятся в памяти процесса. Если файла нет (команда
+не запускалась), страница рендерится при первом обращении; с DEBUG -
+при каждом, чтобы правки шаблонов были видны сразу.
+
+Режимы страниц:
+SHARED - анонимам отдаётся общая копия, остальным шапка заполняется
+    для пользователя;
+STATIC - всем отдаётся анонимная копия без обращения к пользователю и
+    базе (страницы ошибок). Фрагменты из REQUEST_FRAGMENTS, например
+    адрес на странице 404, подставляются в неё на каждый запрос.
+"""
+import gzip
+import hashlib
+import os
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import Resolver404, resolve
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers,
+)
+from django.utils.http import quote_etag
+
+from .fragments import MARKER_RE, fill_fragments
+
+SHARED = 'shared'
+STATIC = 'static'
+# Фрагменты, зависящие только от адреса запроса.
+REQUEST_FRAGMENTS = ('request_path', )
+MIN_COMPRESS_SIZE = 200
+
+Page = namedtuple('Page', ('template_name', 'path', 'mode'))
+Rendered = namedtuple(
+    'Rendered', ('body', 'gzipped', 'etag', 'gzip_etag', 'text')
+)
+
+_registry = {}
+_templates = {}
+_anonymous = {}
+
+
+def register(name, template_name, path=None, mode=SHARED):
+    _registry[name] = Page(template_name, path, mode)
+
+
+def pages():
+    return dict(_registry)
+
+
+def page_file(name):
+    return os.path.join(settings.PRERENDER_ROOT, f'{name}.html')
+
+
+def anonymous_request(page):
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = page.path or '/'
+    request.user = AnonymousUser()
+    try:
+        request.resolver_match = resolve(request.path_info)
+    except Resolver404:
+        request.resolver_match = None
+    return request
+
+
+def render_page(name):
+    """HTML страницы с маркерами вместо фрагментов."""
+    page = _registry[name]
+    request = anonymous_request(page)
+    request.defer_fragments = True
+    return render_to_string(page.template_name, {}, request)
+
+
+def build(name):
+    content = render_page(name)
+    filename = page_file(name)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write(content)
+    _templates.pop(name, None)
+    _anonymous.pop(name, None)
+    return filename, len(content.encode())
+
+
+def clear():
+    """Сбрасывает страницы в памяти, например после новой сборки."""
+    _templates.clear()
+    _anonymous.clear()
+
+
+def load(name):
+    if settings.DEBUG:
+        return render_page(name)
+    content = _templates.get(name)
+    if content is None:
+        try:
+            with open(page_file(name), encoding='utf-8') as file:
+                content = file.read()
+        except FileNotFoundError:
+            content = render_page(name)
+        _templates[name] = content
+    return content
+
+
+def rendered(text):
+    """Тело, gzip-версия и их ETag; для страницы с маркерами - только текст.
+
+    Сжатое тело - другое представление ресурса, и по RFC 7232 у него
+    должен быть свой сильный ETag: иначе кеш может отдать его клиенту
+    без поддержки gzip в ответ на запрос с If-None-Match.
+    """
+    if MARKER_RE.search(text):
+        return Rendered(None, None, None, None, text)
+    body = text.encode()
+    digest = hashlib.md5(body).hexdigest()
+    gzipped = gzip_etag = None
+    if len(body) >= MIN_COMPRESS_SIZE:
+        gzipped = gzip.compress(body)
+        gzip_etag = quote_etag(f'{digest}-gzip')
+    return Rendered(body, gzipped, quote_etag(digest), gzip_etag, text)
+
+
+def anonymous(name):
+    cached = _anonymous.get(name)
+    if cached is None or settings.DEBUG:
+        request = anonymous_request(_registry[name])
+        cached = rendered(fill_fragments(
+            request, load(name), esi=False, skip=REQUEST_FRAGMENTS
+        ))
+        _anonymous[name] = cached
+    return cached
+
+
+def accepts_gzip(request):
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+
+def response(request, name, status=200):
+    mode = _registry[name].mode
+    shared = mode == STATIC or (
+        mode == SHARED and not request.user.is_authenticated
+    )
+    page = anonymous(name) if shared else None
+    if page is None or page.body is None:
+        # Личная шапка или фрагменты адреса запроса: такая страница
+        # не кешируется, поэтому и не сжимается.
+        content = page.text if page else load(name)
+        body = fill_fragments(request, content, esi=False).encode()
+        page = Rendered(
+            body, None, quote_etag(hashlib.md5(body).hexdigest()), None, None
+        )
+    compressed = page.gzipped is not None and accepts_gzip(request)
+    etag = page.gzip_etag if compressed else page.etag
+    if status == 200 and request.method in ('GET', 'HEAD'):
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            patch_vary_headers(not_modified, ('Accept-Encoding', ))
+            return not_modified
+    if compressed:
+        result = HttpResponse(page.gzipped, status=status)
+        result['Content-Encoding'] = 'gzip'
+    else:
+        result = HttpResponse(page.body, status=status)
+    result['ETag'] = etag
+    patch_vary_headers(result, ('Accept-Encoding', ))
+    if mode == SHARED:
+        patch_vary_headers(result, ('Cookie', ))
+    if shared and status == 200:
+        patch_cache_control(
+            result, public=True, max_age=settings.PRERENDER_MAX_AGE
+        )
+    else:
+        patch_cache_control(result, private=True, max_age=0)
+    return result
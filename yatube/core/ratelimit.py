@@ -0,0 +1,79 @@
+"""Счётчики запросов в кеше для ограничения частоты.
+
+Окно фиксированное: первый запрос создаёт ключ со временем жизни окна
+(cache.add), следующие увеличивают его (cache.incr). Проверка стоит
+одного обращения к кешу и не трогает базу.
+
+take() - корзина токенов для частоты запросов вообще: в кеше хранится
+одно число, момент, когда корзина снова станет полной (алгоритм GCRA).
+Чтение и запись не атомарны, поэтому при одновременных запросах с
+одного адреса лимит может быть превышен на несколько запросов.
+
+Счётчики в кеше процесса умножали бы лимит на число воркеров и
+обнулялись бы при перезапуске, поэтому лимиты действуют только с общим
+кешем (enabled()).
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import is_shared
+
+
+def enabled():
+    return is_shared()
+
+
+def client_ip(request):
+    # За прокси адрес клиента передаётся заголовком, который прокси
+    # перезаписывает, например RATELIMIT_IP_HEADER = 'HTTP_X_REAL_IP'.
+    header = getattr(settings, 'RATELIMIT_IP_HEADER', None)
+    if header and request.META.get(header):
+        return request.META[header]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def make_key(scope, value):
+    digest = hashlib.md5(str(value).encode()).hexdigest()
+    return f'ratelimit:{scope}:{digest}'
+
+
+def get_count(key):
+    return cache.get(key, 0)
+
+
+def is_limited(key, limit):
+    return get_count(key) >= limit
+
+
+def hit(key, window):
+    """Учитывает запрос и возвращает число запросов в текущем окне."""
+    if cache.add(key, 1, window):
+        return 1
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Ключ истёк между add и incr.
+        cache.set(key, 1, window)
+        return 1
+
+
+def reset(key):
+    cache.delete(key)
+
+
+def take(key, rate, burst):
+    """Берёт токен из корзины на burst токенов, пополняемой rate в секунду.
+
+    Возвращает 0, если токен взят, иначе сколько секунд ждать следующего.
+    """
+    now = time.time()
+    interval = 1 / rate
+    capacity = burst * interval
+    full_at = max(cache.get(key, now), now) + interval
+    if full_at - now > capacity:
+        return full_at - now - capacity
+    cache.set(key, full_at, int(capacity) + 1)
+    return 0
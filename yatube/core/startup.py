@@ -0,0 +1,88 @@
+"""Прогрев процесса перед первым запросом и замер фаз запуска.
+
+warm_up() вызывается из wsgi.py после создания приложения: компилирует
+шаблоны проекта в кеш загрузчика, заполняет таблицы URL-резолвера,
+загружает заранее отрендеренные страницы и открывает соединения
+с базой. Без этого всё это делает первый запрос каждого воркера.
+Соединения открываются в процессе, который импортирует wsgi.py: при
+запуске gunicorn с --preload это мастер, поэтому прогрев базы по
+умолчанию выключен (WARM_UP_DATABASE).
+"""
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template import engines
+from django.urls import get_resolver, resolve, reverse
+
+from . import prerender
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt')
+
+
+def project_templates():
+    """Имена шаблонов из каталогов DIRS настройки TEMPLATES."""
+    for engine in engines.all():
+        for directory in engine.dirs:
+            for root, _, files in os.walk(directory):
+                for file in files:
+                    if file.endswith(TEMPLATE_EXTENSIONS):
+                        path = os.path.join(root, file)
+                        yield engine, os.path.relpath(path, directory)
+
+
+def warm_templates():
+    count = 0
+    for engine, name in project_templates():
+        engine.get_template(name)
+        count += 1
+    return count
+
+
+def warm_urls():
+    resolver = get_resolver()
+    # reverse() заполняет словари обратного разрешения всех пространств
+    # имён, resolve() - цепочку include() для главной страницы.
+    reverse('posts:index')
+    resolve('/')
+    return len(resolver.url_patterns)
+
+
+def warm_pages():
+    for name in prerender.pages():
+        prerender.anonymous(name)
+    return len(prerender.pages())
+
+
+def warm_database():
+    for alias in connections:
+        connections[alias].ensure_connection()
+    return len(connections.databases)
+
+
+PHASES = (
+    ('urls', warm_urls),
+    ('templates', warm_templates),
+    ('pages', warm_pages),
+    ('database', warm_database),
+)
+
+
+def warm_up():
+    """Выполняет фазы прогрева, возвращает [(фаза, секунд, объектов)]."""
+    timings = []
+    for name, func in PHASES:
+        if name == 'database' and not getattr(
+            settings, 'WARM_UP_DATABASE', False
+        ):
+            continue
+        start = time.perf_counter()
+        count = func()
+        seconds = time.perf_counter() - start
+        timings.append((name, seconds, count))
+        logger.info('Прогрев %s: %.1f мс, %s', name, seconds * 1000, count)
+    return timings
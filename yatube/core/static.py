@@ -0,0 +1,129 @@
+"""WSGI-обёртка, которая отдаёт собранную статику без Django.
+
+Запросы к STATIC_URL обслуживаются прямо из STATIC_ROOT. Если клиент
+принимает br или gzip и рядом лежит сжатая копия (core.storage), отдаётся
+она. Файлы с хешем в имени из манифеста кешируются на год как immutable,
+остальные - на STATIC_UNHASHED_MAX_AGE секунд. Тело возвращается через
+wsgi.file_wrapper, который gunicorn и uWSGI отправляют через sendfile()
+без копирования в память процесса.
+"""
+import json
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from wsgiref.util import FileWrapper
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+FAR_FUTURE_MAX_AGE = 365 * 24 * 60 * 60
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+BLOCK_SIZE = 64 * 1024
+
+
+def load_hashed_names(root):
+    """Имена файлов с хешем из манифеста ManifestStaticFilesStorage."""
+    manifest_name = getattr(
+        staticfiles_storage, 'manifest_name', 'staticfiles.json'
+    )
+    try:
+        with open(os.path.join(root, manifest_name)) as manifest:
+            return frozenset(json.load(manifest).get('paths', {}).values())
+    except (OSError, ValueError):
+        return frozenset()
+
+
+def accepted_encodings(environ):
+    header = environ.get('HTTP_ACCEPT_ENCODING', '')
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticFilesApplication:
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.root = os.path.realpath(root or settings.STATIC_ROOT)
+        self.prefix = prefix or settings.STATIC_URL
+        self.unhashed_max_age = getattr(
+            settings, 'STATIC_UNHASHED_MAX_AGE', 60
+        )
+        self.hashed_names = load_hashed_names(self.root)
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if not path.startswith(self.prefix):
+            return self.application(environ, start_response)
+        if environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+            start_response('405 Method Not Allowed', [
+                ('Allow', 'GET, HEAD'), ('Content-Length', '0'),
+            ])
+            return []
+        name = path[len(self.prefix):]
+        filename = self.find_file(name)
+        if filename is None:
+            start_response('404 Not Found', [
+                ('Content-Type', 'text/plain'), ('Content-Length', '0'),
+            ])
+            return []
+        return self.serve(environ, start_response, name, filename)
+
+    def find_file(self, name):
+        filename = os.path.realpath(os.path.join(self.root, name))
+        # Запрещаем выход за пределы STATIC_ROOT через ../ и симлинки.
+        if not filename.startswith(self.root + os.sep):
+            return None
+        if not os.path.isfile(filename):
+            return None
+        return filename
+
+    def serve(self, environ, start_response, name, filename):
+        content_type, _ = mimetypes.guess_type(filename)
+        headers = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Vary', 'Accept-Encoding'),
+        ]
+        accepted = accepted_encodings(environ)
+        for coding, suffix in ENCODINGS:
+            if coding in accepted and os.path.isfile(filename + suffix):
+                filename += suffix
+                headers.append(('Content-Encoding', coding))
+                break
+        stat = os.stat(filename)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if name in self.hashed_names:
+            cache_control = f'public, max-age={FAR_FUTURE_MAX_AGE}, immutable'
+        else:
+            cache_control = f'public, max-age={self.unhashed_max_age}'
+        headers += [
+            ('Cache-Control', cache_control),
+            ('ETag', etag),
+            ('Last-Modified', formatdate(stat.st_mtime, usegmt=True)),
+        ]
+        if self.not_modified(environ, etag, stat.st_mtime):
+            start_response('304 Not Modified', headers)
+            return []
+        headers.append(('Content-Length', str(stat.st_size)))
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        file_wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return file_wrapper(open(filename, 'rb'), BLOCK_SIZE)
+
+    @staticmethod
+    def not_modified(environ, etag, mtime):
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')]
+        if_modified_since = environ.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
@@ -0,0 +1,60 @@
+"""Хранилище статики для продакшена.
+
+При collectstatic файлы получают хеш содержимого в имени (манифест
+staticfiles.json), а текстовые файлы дополнительно сжимаются в .gz и,
+если установлен пакет brotli, в .br. Сжатые копии отдаёт
+core.static.StaticFilesApplication, поэтому на каждый запрос ничего
+не сжимается.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.html', '.json', '.xml',
+)
+# Файлы меньше порога почти не сжимаются, а заголовки съедают выигрыш.
+COMPRESS_MIN_SIZE = 256
+
+
+def compress_variants(content):
+    """Пары (расширение, сжатое содержимое), которые меньше исходного."""
+    variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(content)))
+    return [
+        (suffix, compressed) for suffix, compressed in variants
+        if len(compressed) < len(content)
+    ]
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in paths:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            # Сжимаем и исходное имя, и имя с хешем: шаблоны ссылаются
+            # на второе, но сторонний код может запросить первое.
+            for path in {name, self.stored_name(name)}:
+                yield from self.compress(path)
+
+    def compress(self, path):
+        with self.open(path) as original:
+            content = original.read()
+        if len(content) < COMPRESS_MIN_SIZE:
+            return
+        for suffix, compressed in compress_variants(content):
+            compressed_path = path + suffix
+            if self.exists(compressed_path):
+                self.delete(compressed_path)
+            self._save(compressed_path, ContentFile(compressed))
+            yield path, compressed_path, True
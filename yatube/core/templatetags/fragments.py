@@ -0,0 +1,22 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from core.fragments import get_fragment, marker
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def fragment(context, name, **params):
+    request = context.request
+    params = {
+        key: str(value) for key, value in params.items() if value is not None
+    }
+    if getattr(request, 'defer_fragments', False):
+        return mark_safe(marker(name, params))
+    current = get_fragment(name)
+    fragment_template = context.template.engine.get_template(
+        current.template_name
+    )
+    with context.push(**current.get_context(request, params)):
+        return fragment_template.render(context)
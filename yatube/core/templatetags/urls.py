@@ -0,0 +1,11 @@
+from django import template
+
+from core.urlbuilder import build
+
+register = template.Library()
+
+
+@register.simple_tag
+def url_for(viewname, *args):
+    """Аналог {% url %} с позиционными аргументами на core.urlbuilder."""
+    return build(viewname, *args)
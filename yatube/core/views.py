@@ -1,18 +1,121 @@
-from django.shortcuts import render
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+from django.views.generic import View
+
+from . import media, prerender
+from .fragments import get_fragment, render_fragment
 
 
 def page_not_found(request, exception):
-    return render(request, 'core/404.html', {'path': request.path}, status=404)
+    return prerender.response(request, '404', status=404)
 
 
 def server_error(request):
-    return render(request, 'core/500.html', status=500)
+    return prerender.response(request, '500', status=500)
 
 
 def permission_denied(request, exception):
-    return render(request, 'core/403.html', status=403)
+    return prerender.response(request, '403', status=403)
 
 
 def csrf_failure(request, reason=''):
-    return render(request, 'core/403csrf.html')
+    return prerender.response(request, '403csrf', status=403)
+
+
+class PrerenderedView(View):
+    """Страница из core.prerender."""
+    http_method_names = ['get', 'head']
+    page = None
+
+    def get(self, request, *args, **kwargs):
+        return prerender.response(request, self.page)
+
+
+def fragment(request, name):
+    if get_fragment(name) is None:
+        raise Http404
+    try:
+        html = render_fragment(request, name, request.GET.dict())
+    except (TypeError, ValueError):
+        # Неверные параметры фрагмента в адресе.
+        raise Http404
+    response = HttpResponse(html)
+    patch_cache_control(response, private=True, max_age=0)
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        filename = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    # Закрытый файл отдаём как несуществующий, не раскрывая его наличие.
+    if not os.path.isfile(filename) or not media.has_access(request, path):
+        raise Http404
+    stat = os.stat(filename)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = _media_response(request, path, filename, stat.st_size,
+                                   etag, last_modified)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if media.is_restricted(path):
+        patch_cache_control(response, private=True, max_age=0)
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.MEDIA_MAX_AGE
+        )
+    return response
+
 
+def _media_response(request, path, filename, size, etag, last_modified):
+    headers = media.sendfile_headers(path, filename)
+    if headers is not None:
+        # Тело, диапазоны и условные заголовки обработает веб-сервер.
+        content_type, _ = mimetypes.guess_type(filename)
+        response = HttpResponse(
+            content_type=content_type or 'application/octet-stream'
+        )
+        for header, value in headers.items():
+            response[header] = value
+        return response
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if (if_range is None or if_range == etag
+            or parse_http_date_safe(if_range) == last_modified):
+        try:
+            byte_range = media.parse_range(
+                request.META.get('HTTP_RANGE'), size
+            )
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    file = open(filename, 'rb')
+    if byte_range is None:
+        response = FileResponse(file)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            media.RangeFile(file, start, length),
+            filename=os.path.basename(filename),
+        )
+        response.status_code = 206
+        response['Content-Length'] = length
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
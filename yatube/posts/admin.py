@@ -1,6 +1,38 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.html import format_html
 
-from .models import Post, Group
+from core.jobs import enqueue
+from . import counters
+from .models import Post, Group, User
+from .utils import EstimatedCountPaginator
+
+
+class PostActionForm(ActionForm):
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.all(),
+        required=False,
+        label='Группа',
+    )
+
+
+def enqueue_action(modeladmin, request, name, ids_param, queryset, **params):
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    job = enqueue(name, **{ids_param: ids}, **params)
+    modeladmin.message_user(
+        request,
+        format_html(
+            'Задача <a href="{}">{}</a> поставлена в очередь, объектов: {}.',
+            reverse('admin:core_job_change', args=(job.pk,)),
+            job,
+            len(ids),
+        ),
+        messages.SUCCESS,
+    )
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -12,10 +44,106 @@ class PostAdmin(admin.ModelAdmin):
         'group',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
+    action_form = PostActionForm
+    actions = (
+        'reassign_group',
+        'delete_in_background',
+        'purge_images',
+    )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if db_field.name == 'group':
+            # Один список групп на все строки list_editable вместо
+            # отдельного запроса к Group для каждой строки.
+            formfield.choices = list(formfield.choices)
+        return formfield
+
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        # Кешированный счётчик годится только для нефильтрованного списка.
+        scope = None if queryset.query.where.children else counters.SCOPE_ALL
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page, scope=scope
+        )
+
+    def delete_queryset(self, request, queryset):
+        scopes = counters.affected_scopes(queryset)
+        super().delete_queryset(request, queryset)
+        counters.invalidate(scopes)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Посты автора с таким логином или группы с таким слагом
+        # добавляются к найденным по тексту; логин и слаг ищутся по
+        # уникальному индексу.
+        results, use_distinct = super().get_search_results(
+            request, queryset, search_term
+        )
+        term = search_term.strip()
+        if term:
+            author_ids = list(
+                User.objects.filter(username=term).values_list('pk', flat=True)
+            )
+            group_ids = list(
+                Group.objects.filter(slug=term).values_list('pk', flat=True)
+            )
+            if author_ids or group_ids:
+                results |= queryset.filter(
+                    Q(author__in=author_ids) | Q(group__in=group_ids)
+                )
+        return results, use_distinct
+
+    def reassign_group(self, request, queryset):
+        try:
+            group = self.action_form.base_fields['group'].clean(
+                request.POST.get('group')
+            )
+        except ValidationError:
+            self.message_user(request, 'Группа не найдена.', messages.ERROR)
+            return
+        enqueue_action(
+            self, request, 'posts.reassign_group', 'post_ids', queryset,
+            group_id=group.pk if group else None,
+        )
+    reassign_group.short_description = 'Перенести в группу (в фоне)'
+    reassign_group.allowed_permissions = ('change',)
+
+    def delete_in_background(self, request, queryset):
+        enqueue_action(
+            self, request, 'posts.delete_posts', 'post_ids', queryset
+        )
+    delete_in_background.short_description = 'Удалить посты (в фоне)'
+    delete_in_background.allowed_permissions = ('delete',)
+
+    def purge_images(self, request, queryset):
+        enqueue_action(
+            self, request, 'posts.purge_images', 'post_ids', queryset
+        )
+    purge_images.short_description = 'Удалить картинки и миниатюры (в фоне)'
+    purge_images.allowed_permissions = ('change',)
+
+
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'title', 'slug')
+    search_fields = ('=slug', 'title')
+    actions = ('delete_in_background',)
+
+    def delete_in_background(self, request, queryset):
+        enqueue_action(
+            self, request, 'posts.delete_groups', 'group_ids', queryset
+        )
+    delete_in_background.short_description = 'Удалить группы (в фоне)'
+    delete_in_background.allowed_permissions = ('delete',)
 
 
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
+admin.site.register(Group, GroupAdmin)
@@ -0,0 +1,117 @@
+"""JSON API только для чтения: ленты и пост с комментариями.
+
+Ленты листаются курсором (?cursor=...&limit=...), а с ?format=ndjson
+отдаются целиком потоком: по посту на строку, из базы частями по
+API_STREAM_CHUNK_SIZE строк.
+"""
+import json
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.views.decorators.http import require_safe
+
+from core.decorators import conditional_page
+from . import etags
+from .models import Post, Group, User
+from .serializers import (
+    comment_rows, cursor_page, post_rows, serialize_comment, serialize_post,
+)
+from .utils import NUMBER_OF_POSTS
+
+MAX_PAGE_SIZE = 100
+JSON_PARAMS = {'ensure_ascii': False}
+
+
+def error(detail, status):
+    return JsonResponse(
+        {'detail': detail}, status=status, json_dumps_params=JSON_PARAMS
+    )
+
+
+def stream_ndjson(rows, serialize):
+    chunk_size = getattr(settings, 'API_STREAM_CHUNK_SIZE', 1000)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield json.dumps(serialize(row), **JSON_PARAMS) + '\n'
+
+
+def feed_response(request, queryset):
+    if request.GET.get('format') == 'ndjson':
+        return StreamingHttpResponse(
+            stream_ndjson(post_rows(queryset), serialize_post),
+            content_type='application/x-ndjson; charset=utf-8',
+        )
+    try:
+        limit = min(
+            int(request.GET.get('limit', NUMBER_OF_POSTS)), MAX_PAGE_SIZE
+        )
+        if limit < 1:
+            raise ValueError(limit)
+        results, next_cursor = cursor_page(
+            queryset, request.GET.get('cursor'), limit
+        )
+    except ValueError:
+        return error('Неверный курсор или limit.', 400)
+    next_url = None
+    if next_cursor:
+        query = urlencode({'cursor': next_cursor, 'limit': limit})
+        next_url = request.build_absolute_uri(f'{request.path}?{query}')
+    return JsonResponse(
+        {'results': results, 'next': next_url},
+        json_dumps_params=JSON_PARAMS,
+    )
+
+
+@require_safe
+@conditional_page(etags.index_validators)
+def index(request):
+    return feed_response(request, Post.objects.all())
+
+
+@require_safe
+@conditional_page(etags.group_validators)
+def group_posts(request, slug):
+    group_id = Group.objects.filter(slug=slug).values_list(
+        'pk', flat=True
+    ).first()
+    if group_id is None:
+        return error('Группа не найдена.', 404)
+    return feed_response(request, Post.objects.filter(group_id=group_id))
+
+
+@require_safe
+@conditional_page(etags.profile_validators)
+def profile_posts(request, username):
+    author_id = User.objects.filter(username=username).values_list(
+        'pk', flat=True
+    ).first()
+    if author_id is None:
+        return error('Пользователь не найден.', 404)
+    return feed_response(request, Post.objects.filter(author_id=author_id))
+
+
+@require_safe
+@conditional_page(etags.follow_validators)
+def follow_posts(request):
+    if not request.user.is_authenticated:
+        return error('Нужна авторизация.', 401)
+    return feed_response(
+        request, Post.objects.filter(author__following__user=request.user)
+    )
+
+
+@require_safe
+@conditional_page(etags.post_detail_validators)
+def post_detail(request, post_id):
+    row = post_rows(Post.objects.filter(pk=post_id)).first()
+    if row is None:
+        return error('Пост не найден.', 404)
+    data = serialize_post(row)
+    data['comments'] = [
+        serialize_comment(comment) for comment in comment_rows(post_id)
+    ]
+    data['url'] = request.build_absolute_uri(
+        reverse('posts:post_detail', args=(post_id, ))
+    )
+    return JsonResponse(data, json_dumps_params=JSON_PARAMS)
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import counters
+from .models import Post, Comment, ArchivedPost, ArchivedComment
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 365
+DEFAULT_ARCHIVE_BATCH_SIZE = 500
+
+POST_FIELDS = ('id', 'text', 'pub_date', 'author_id', 'group_id', 'image')
+COMMENT_FIELDS = ('id', 'post_id', 'author_id', 'text', 'created')
+
+
+def archive_cutoff(days=None):
+    if days is None:
+        days = getattr(
+            settings, 'POSTS_ARCHIVE_AFTER_DAYS', DEFAULT_ARCHIVE_AFTER_DAYS
+        )
+    return timezone.now() - timedelta(days=days)
+
+
+def archive_batch(cutoff, batch_size):
+    """Переносит в архив одну пачку постов старше cutoff.
+
+    Сначала записи копируются в архив, затем удаляются из рабочих
+    таблиц, поэтому прерванный перенос можно просто повторить.
+    """
+    post_ids = list(
+        Post.objects.filter(pub_date__lt=cutoff)
+        .order_by('pub_date')
+        .values_list('pk', flat=True)[:batch_size]
+    )
+    if not post_ids:
+        return 0
+    posts = Post.objects.filter(pk__in=post_ids).values(*POST_FIELDS)
+    comments = (
+        Comment.objects.filter(post_id__in=post_ids).values(*COMMENT_FIELDS)
+    )
+    ArchivedPost.objects.bulk_create(
+        (ArchivedPost(**post) for post in posts),
+        ignore_conflicts=True,
+    )
+    ArchivedComment.objects.bulk_create(
+        (ArchivedComment(**comment) for comment in comments),
+        ignore_conflicts=True,
+    )
+    scopes = counters.affected_scopes(Post.objects.filter(pk__in=post_ids))
+    with transaction.atomic(using=Post.objects.db):
+        Comment.objects.filter(post_id__in=post_ids).delete()
+        Post.objects.filter(pk__in=post_ids).delete()
+    counters.invalidate(scopes)
+    return len(post_ids)
+
+
+def archive_old_posts(days=None, batch_size=DEFAULT_ARCHIVE_BATCH_SIZE):
+    cutoff = archive_cutoff(days)
+    total = 0
+    while True:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            return total
+        total += moved
@@ -0,0 +1,155 @@
+"""Счётчики постов и поколения для областей ленты.
+
+Область (scope) - набор постов одной ленты: все посты, группа, автор,
+подписки пользователя, а также отдельный пост с комментариями. Для
+каждой области в кеше хранится число постов и поколение, которое
+меняется при любой записи в область. Название и адрес группы
+выводятся у постов во всех лентах, поэтому изменение любой группы
+меняет поколение общей области SCOPE_GROUPS. Без общего кеша
+(core.cache) числа постов не кешируются: у каждого процесса они были
+бы свои.
+"""
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import is_shared
+
+SCOPE_ALL = 'all'
+SCOPE_GROUPS = 'groups'
+COUNT_KEY = 'posts:count:{}'
+GENERATION_KEY = 'posts:generation:{}'
+DEFAULT_COUNT_TIMEOUT = 60 * 60
+DEFAULT_FOLLOW_COUNT_TIMEOUT = 60
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def follow_scope(user_id):
+    return f'follow:{user_id}'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def post_scopes(author_id, group_id):
+    scopes = [SCOPE_ALL, author_scope(author_id)]
+    if group_id is not None:
+        scopes.append(group_scope(group_id))
+    return scopes
+
+
+def get_cached_count(scope):
+    if not is_shared():
+        return None
+    return cache.get(COUNT_KEY.format(scope))
+
+
+def set_cached_count(scope, count):
+    if not is_shared():
+        return
+    if scope.startswith('follow:'):
+        timeout = getattr(
+            settings, 'POSTS_FOLLOW_COUNT_TIMEOUT',
+            DEFAULT_FOLLOW_COUNT_TIMEOUT,
+        )
+    else:
+        timeout = getattr(
+            settings, 'POSTS_COUNT_TIMEOUT', DEFAULT_COUNT_TIMEOUT
+        )
+    cache.set(COUNT_KEY.format(scope), count, timeout)
+
+
+def adjust_counts(scopes, delta):
+    if not is_shared():
+        return
+    for scope in scopes:
+        try:
+            cache.incr(COUNT_KEY.format(scope), delta)
+        except ValueError:
+            # Счётчика нет в кеше - он будет посчитан при чтении.
+            pass
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def get_generation(scope):
+    """Поколение области - время последней записи в мс (монотонно).
+
+    Если значения нет в кеше, поколением становится текущее время:
+    так сброс кеша приводит только к лишней перерисовке страниц.
+    """
+    key = GENERATION_KEY.format(scope)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, now_ms(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump(scopes):
+    for scope in scopes:
+        key = GENERATION_KEY.format(scope)
+        cache.set(key, max((cache.get(key) or 0) + 1, now_ms()), None)
+
+
+def invalidate(scopes):
+    scopes = list(scopes)
+    cache.delete_many([COUNT_KEY.format(scope) for scope in scopes])
+    bump(scopes)
+
+
+def post_created(post):
+    scopes = post_scopes(post.author_id, post.group_id)
+    adjust_counts(scopes, 1)
+    bump(scopes + [post_scope(post.pk)])
+
+
+def post_changed(post, old_group_id):
+    if old_group_id != post.group_id:
+        if old_group_id is not None:
+            adjust_counts([group_scope(old_group_id)], -1)
+        if post.group_id is not None:
+            adjust_counts([group_scope(post.group_id)], 1)
+        bump(post_scopes(post.author_id, old_group_id))
+    bump(post_scopes(post.author_id, post.group_id) + [post_scope(post.pk)])
+
+
+def post_deleted(post, post_id):
+    scopes = post_scopes(post.author_id, post.group_id)
+    adjust_counts(scopes, -1)
+    bump(scopes + [post_scope(post_id)])
+
+
+def posts_deleted(rows):
+    """Посты [(id, author_id, group_id)], удалённые каскадом."""
+    deltas = Counter()
+    scopes = set()
+    for post_id, author_id, group_id in rows:
+        deltas.update(post_scopes(author_id, group_id))
+        scopes.add(post_scope(post_id))
+    for scope, count in deltas.items():
+        adjust_counts([scope], -count)
+    bump(scopes | set(deltas))
+
+
+def affected_scopes(queryset):
+    """Области постов queryset; сбрасываются после update()/delete()."""
+    scopes = {SCOPE_ALL}
+    for post_id, author_id, group_id in (
+        queryset.order_by().values_list('pk', 'author_id', 'group_id')
+    ):
+        scopes.add(post_scope(post_id))
+        scopes.update(post_scopes(author_id, group_id))
+    return scopes
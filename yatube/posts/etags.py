@@ -0,0 +1,149 @@
+"""Валидаторы условного GET и ключи кеша для страниц posts.
+
+И валидаторы, и ключи split-кеша (core.decorators.split_cache_page)
+строятся из поколений областей (posts.counters), поэтому для 304 ответа
+или страницы из кеша не нужен ни один запрос к базе, кроме поиска
+группы, автора или поста по уникальному индексу.
+"""
+from datetime import datetime, timezone
+from hashlib import md5
+
+from django.db.models import Max
+
+from core.fragments import esi_enabled
+from . import counters, lookups
+from .models import Post, Group, User, Comment
+
+
+def _from_ms(ms):
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def _generations_key(request, scopes, generations):
+    return '|'.join(
+        [request.get_full_path()]
+        + [f'{scope}:{gen}' for scope, gen in zip(scopes, generations)]
+    )
+
+
+def scope_validators(request, *scopes, shared=False):
+    """ETag и Last-Modified по поколениям областей.
+
+    Для страниц с shared=True в режиме ESI тело одинаково для всех
+    пользователей, и ETag от пользователя не зависит.
+    """
+    generations = [counters.get_generation(scope) for scope in scopes]
+    key = _generations_key(request, scopes, generations)
+    if not (shared and esi_enabled()):
+        key = f'{key}|{request.user.pk or 0}'
+    etag = md5(key.encode()).hexdigest()
+    return etag, _from_ms(max(generations))
+
+
+def scope_page_key(request, scopes):
+    """Ключ split-кеша страницы или None, если страницы нет."""
+    if scopes is None:
+        return None
+    generations = [counters.get_generation(scope) for scope in scopes]
+    return _generations_key(request, scopes, generations)
+
+
+def index_scopes(request):
+    return [counters.SCOPE_ALL, counters.SCOPE_GROUPS]
+
+
+def group_scopes(request, slug):
+    group_id = lookups.first(
+        lookups.SLUG, slug,
+        Group.objects.filter(slug=slug).values_list('pk', flat=True),
+    )
+    if group_id is None:
+        return None
+    return [counters.group_scope(group_id)]
+
+
+def profile_scopes(request, username):
+    author_id = lookups.first(
+        lookups.USERNAME, username,
+        User.objects.filter(username=username).values_list('pk', flat=True),
+    )
+    if author_id is None:
+        return None
+    return [counters.author_scope(author_id), counters.SCOPE_GROUPS]
+
+
+def post_detail_scopes(request, post_id):
+    author_id = Post.objects.filter(pk=post_id).values_list(
+        'author_id', flat=True
+    ).first()
+    if author_id is None:
+        return None
+    return [
+        counters.post_scope(post_id),
+        counters.author_scope(author_id),
+        counters.SCOPE_GROUPS,
+    ]
+
+
+def index_page_key(request):
+    return scope_page_key(request, index_scopes(request))
+
+
+def group_page_key(request, slug):
+    return scope_page_key(request, group_scopes(request, slug))
+
+
+def profile_page_key(request, username):
+    return scope_page_key(request, profile_scopes(request, username))
+
+
+def post_detail_page_key(request, post_id):
+    return scope_page_key(request, post_detail_scopes(request, post_id))
+
+
+def index_validators(request):
+    return scope_validators(request, *index_scopes(request), shared=True)
+
+
+def group_validators(request, slug):
+    scopes = group_scopes(request, slug)
+    if scopes is None:
+        return None, None
+    return scope_validators(request, *scopes, shared=True)
+
+
+def profile_validators(request, username):
+    scopes = profile_scopes(request, username)
+    if scopes is None:
+        return None, None
+    if request.user.is_authenticated and not esi_enabled():
+        # Кнопка подписки зависит от подписок текущего пользователя.
+        scopes.append(counters.follow_scope(request.user.pk))
+    return scope_validators(request, *scopes, shared=True)
+
+
+def follow_validators(request):
+    if not request.user.is_authenticated:
+        return None, None
+    # Новый пост любого автора мог попасть в ленту подписок.
+    return scope_validators(
+        request,
+        counters.SCOPE_ALL,
+        counters.SCOPE_GROUPS,
+        counters.follow_scope(request.user.pk),
+    )
+
+
+def post_detail_validators(request, post_id):
+    pub_date = Post.objects.filter(pk=post_id).values_list(
+        'pub_date', flat=True
+    ).first()
+    if pub_date is None:
+        return None, None
+    etag, changed = scope_validators(
+        request, *post_detail_scopes(request, post_id), shared=True
+    )
+    latest_comment = Comment.objects.filter(post_id=post_id).aggregate(
+        latest=Max('created')
+    )['latest']
+    return etag, max(filter(None, (pub_date, latest_comment, changed)))
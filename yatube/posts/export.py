@@ -0,0 +1,144 @@
+"""Потоковая выгрузка постов и комментариев пользователя.
+
+Строки читаются через values().iterator(chunk_size=...) и сразу
+превращаются в NDJSON, поэтому память не растёт с числом постов. В zip
+те же строки пишутся через ZipFile в буфер, который опустошается после
+каждой строки. Картинки в архив не копируются: в постах остаются имя
+файла, адрес и хеш из колонок Post.image_*.
+
+Архивные посты и комментарии (posts.archive) выгружаются после рабочих
+с полем archived. Архив может лежать в отдельной базе (posts.routers),
+поэтому его запросы обходятся без JOIN с группами.
+"""
+import json
+
+from django.conf import settings
+
+from .images import EMPTY_METADATA
+from .models import Post, Comment, Group, ArchivedPost, ArchivedComment
+from .serializers import post_rows, serialize_post
+
+FORMATS = ('ndjson', 'zip')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'zip': 'application/zip',
+}
+EXPORT_COMMENT_FIELDS = ('id', 'post_id', 'text', 'created')
+ARCHIVED_POST_FIELDS = ('id', 'text', 'pub_date', 'group_id', 'image')
+
+
+def chunk_size():
+    return getattr(settings, 'POSTS_EXPORT_CHUNK_SIZE', 2000)
+
+
+def post_record(row, archived):
+    data = serialize_post(row)
+    if data['image'] is not None:
+        data['image']['name'] = row['image']
+    data['archived'] = archived
+    return data
+
+
+def post_records(author):
+    rows = post_rows(Post.objects.filter(author=author))
+    for row in rows.iterator(chunk_size=chunk_size()):
+        yield post_record(row, archived=False)
+    archived = ArchivedPost.objects.filter(author_id=author.pk)
+    # Список id, а не подзапрос: архив может лежать в другой базе.
+    group_ids = list(
+        archived.exclude(group_id=None).order_by()
+        .values_list('group_id', flat=True).distinct()
+    )
+    group_slugs = dict(
+        Group.objects.filter(pk__in=group_ids).values_list('pk', 'slug')
+    )
+    rows = archived.order_by(
+        '-pub_date', '-id'
+    ).values(*ARCHIVED_POST_FIELDS)
+    for row in rows.iterator(chunk_size=chunk_size()):
+        # У архивных постов нет колонок метаданных картинки.
+        yield post_record({
+            **EMPTY_METADATA,
+            **row,
+            'author__username': author.username,
+            'group__slug': group_slugs.get(row['group_id']),
+        }, archived=True)
+
+
+def comment_records(author):
+    for model, archived in ((Comment, False), (ArchivedComment, True)):
+        rows = model.objects.filter(author_id=author.pk).order_by(
+            'id'
+        ).values(*EXPORT_COMMENT_FIELDS)
+        for row in rows.iterator(chunk_size=chunk_size()):
+            row['created'] = row['created'].isoformat()
+            row['archived'] = archived
+            yield row
+
+
+def to_line(data):
+    return (json.dumps(data, ensure_ascii=False) + '\n').encode()
+
+
+def export_ndjson(author):
+    """Посты, затем комментарии; у каждой строки есть поле type."""
+    for data in post_records(author):
+        yield to_line({'type': 'post', **data})
+    for data in comment_records(author):
+        yield to_line({'type': 'comment', **data})
+
+
+class StreamBuffer:
+    """Файл только для записи, из которого ZipFile забирают по частям."""
+
+    def __init__(self):
+        self.chunks = []
+        self.offset = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def export_zip(author):
+    """Архив с posts.ndjson и comments.ndjson."""
+    return (chunk for chunk in _zip_chunks(author) if chunk)
+
+
+def _zip_chunks(author):
+    import zipfile
+
+    buffer = StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, records in (
+            ('posts.ndjson', post_records(author)),
+            ('comments.ndjson', comment_records(author)),
+        ):
+            with archive.open(name, 'w', force_zip64=True) as member:
+                for data in records:
+                    member.write(to_line(data))
+                    yield buffer.pop()
+            yield buffer.pop()
+    yield buffer.pop()
+
+
+def export(author, export_format):
+    if export_format == 'zip':
+        return export_zip(author)
+    return export_ndjson(author)
+
+
+def filename(author, export_format):
+    return f'{author.username}-export.{export_format}'
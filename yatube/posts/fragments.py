@@ -0,0 +1,38 @@
+from django.core.exceptions import ValidationError
+
+from core.fragments import register
+from .forms import CommentForm
+from .models import Follow, User
+
+
+def comment_form_context(request, post_id):
+    return {'post_id': int(post_id), 'form': CommentForm()}
+
+
+def switcher_context(request):
+    return {}
+
+
+def follow_button_context(request, username):
+    try:
+        User.username_validator(username)
+    except ValidationError:
+        raise ValueError(username)
+    following = (
+        request.user.is_authenticated
+        and Follow.objects.filter(
+            user=request.user, author__username=username
+        ).exists()
+    )
+    return {'username': username, 'following': following}
+
+
+register('switcher', 'posts/includes/switcher.html', switcher_context)
+register(
+    'comment_form', 'posts/includes/comment_form.html', comment_form_context
+)
+register(
+    'follow_button',
+    'posts/includes/follow_button.html',
+    follow_button_context,
+)
@@ -0,0 +1,269 @@
+"""Адаптивные варианты картинок постов.
+
+Картинка поста обрезается под пропорции карточки (960x339) и кодируется
+в нескольких ширинах в WebP и, если Pillow собран с поддержкой, в AVIF.
+Варианты строит фоновая задача posts.build_image_variants (после
+загрузки картинки) или команда build_image_variants, а готовые srcset
+сохраняются в колонке Post.image_sources: задачу выполняет отдельный
+процесс, и страницы не должны зависеть от его кеша. Тег {% picture %}
+(posts.templatetags.images)
+выводит их в <picture>, и браузер выбирает ширину под экран. Запасной
+вариант в исходном формате остаётся для старых браузеров.
+
+Все файлы создаёт sorl-thumbnail (бэкенд и движок в posts.thumbnail),
+поэтому они попадают в его kvstore и удаляются вместе с миниатюрами.
+Pillow и sorl импортируются внутри функций: модуль нужен моделям, а
+картинки обрабатывает малая часть запросов.
+"""
+import base64
+import hashlib
+import io
+import json
+import logging
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+CARD_WIDTH = 960
+CARD_HEIGHT = 339
+VARIANT_WIDTHS = (320, 640, 960)
+THUMBNAIL_OPTIONS = {'crop': 'center', 'upscale': True}
+MIME_TYPES = {'AVIF': 'image/avif', 'WEBP': 'image/webp'}
+ORIGINAL = 'original'
+# Заглушка - крошечная копия картинки с пропорциями карточки, которая
+# растягивается браузером с размытием, пока грузится сама картинка.
+PLACEHOLDER_SIZE = (24, 8)
+PLACEHOLDER_QUALITY = 40
+# Значения полей Post.image_* для поста без картинки.
+EMPTY_METADATA = {
+    'image_width': None,
+    'image_height': None,
+    'image_format': '',
+    'image_size': None,
+    'image_hash': '',
+    'image_placeholder': '',
+}
+
+ImageInfo = namedtuple('ImageInfo', (
+    'name', 'url', 'width', 'height', 'format', 'size', 'hash', 'placeholder',
+    'sources',
+))
+
+
+def make_placeholder(image):
+    """data: URI с JPEG-заглушкой размером PLACEHOLDER_SIZE."""
+    from PIL import ImageOps
+
+    small = ImageOps.fit(image.convert('RGB'), PLACEHOLDER_SIZE)
+    buffer = io.BytesIO()
+    small.save(buffer, 'JPEG', quality=PLACEHOLDER_QUALITY, optimize=True)
+    data = base64.b64encode(buffer.getvalue()).decode()
+    return f'data:image/jpeg;base64,{data}'
+
+
+def read_metadata(file):
+    """Метаданные картинки для полей Post.image_*, прочитанные один раз.
+
+    Если файл не удалось прочитать как картинку, возвращаются пустые
+    значения EMPTY_METADATA.
+    """
+    from PIL import Image
+
+    try:
+        file.seek(0)
+        content = file.read()
+        with Image.open(io.BytesIO(content)) as image:
+            image.load()
+            return {
+                'image_width': image.width,
+                'image_height': image.height,
+                'image_format': image.format or '',
+                'image_size': len(content),
+                'image_hash': hashlib.sha256(content).hexdigest(),
+                'image_placeholder': make_placeholder(image),
+            }
+    except (OSError, ValueError) as error:
+        logger.warning('Не удалось прочитать картинку %s: %s', file, error)
+        return dict(EMPTY_METADATA)
+    finally:
+        file.seek(0)
+
+
+def read_stored_metadata(name):
+    """read_metadata для файла в хранилище по имени."""
+    try:
+        with default_storage.open(name) as file:
+            return read_metadata(file)
+    except OSError as error:
+        logger.warning('Не удалось открыть картинку %s: %s', name, error)
+        return dict(EMPTY_METADATA)
+
+
+def image_info(post):
+    """Данные картинки поста только из колонок, без чтения файла.
+
+    Возвращает ImageInfo или None, если картинки нет. Подходит и для
+    моделей без колонок метаданных (ArchivedPost): их поля будут пустыми.
+    """
+    name = post.image.name if post.image else ''
+    if not name:
+        return None
+    return ImageInfo(
+        name=name,
+        url=default_storage.url(name),
+        sources=getattr(post, 'image_sources', ''),
+        **{
+            field[len('image_'):]: getattr(post, field, empty)
+            for field, empty in EMPTY_METADATA.items()
+        },
+    )
+
+
+def variant_formats():
+    """Форматы вариантов от лучшего сжатия к худшему."""
+    from PIL import features
+
+    formats = ['WEBP']
+    if features.check('avif'):
+        formats.insert(0, 'AVIF')
+    return formats
+
+
+def geometry(width):
+    return f'{width}x{round(width * CARD_HEIGHT / CARD_WIDTH)}'
+
+
+def original_thumbnail(image):
+    from sorl.thumbnail import get_thumbnail
+
+    return get_thumbnail(image, geometry(CARD_WIDTH), **THUMBNAIL_OPTIONS)
+
+
+def variant(image, image_format, width):
+    from sorl.thumbnail import get_thumbnail
+
+    return get_thumbnail(
+        image, geometry(width), format=image_format, **THUMBNAIL_OPTIONS
+    )
+
+
+def picture_sources(info):
+    """Источники для <picture>: [(mime-тип, srcset)] и адрес запасной картинки.
+
+    Всё берётся из колонки Post.image_sources, которую заполняет
+    build_variants, поэтому страница не открывает файлы и не кодирует
+    варианты. Пока вариантов нет, выводится только запасная миниатюра sorl.
+    """
+    if info.sources:
+        data = json.loads(info.sources)
+        return [tuple(source) for source in data['sources']], data['fallback']
+    return [], original_thumbnail(info.name).url
+
+
+def save_sources(name, sources, fallback):
+    """Записывает srcset в посты с картинкой name."""
+    from .models import Post
+
+    value = json.dumps({'sources': sources, 'fallback': fallback})
+    # save(), а не update(): страницы с картинкой должны перерисоваться.
+    for post in Post.objects.filter(image=name):
+        post.image_sources = value
+        post.save(update_fields=['image_sources'])
+
+
+def build_variants(image):
+    """Создаёт все варианты картинки.
+
+    Возвращает {(формат, ширина): (секунд на кодирование, байт)}; запасная
+    картинка лежит под ключом (ORIGINAL, CARD_WIDTH).
+    """
+    stats = {}
+    srcsets = {}
+    fallback = None
+    targets = [(ORIGINAL, CARD_WIDTH)] + [
+        (image_format, width)
+        for image_format in variant_formats()
+        for width in VARIANT_WIDTHS
+    ]
+    for image_format, width in targets:
+        start = time.perf_counter()
+        if image_format == ORIGINAL:
+            thumbnail = original_thumbnail(image)
+        else:
+            thumbnail = variant(image, image_format, width)
+        seconds = time.perf_counter() - start
+        stats[image_format, width] = (
+            seconds, thumbnail.storage.size(thumbnail.name)
+        )
+        if image_format == ORIGINAL:
+            fallback = thumbnail.url
+        else:
+            srcsets.setdefault(image_format, []).append(
+                f'{thumbnail.url} {width}w'
+            )
+    save_sources(str(image), [
+        (MIME_TYPES[image_format], ', '.join(srcset))
+        for image_format, srcset in srcsets.items()
+    ], fallback)
+    return stats
+
+
+def build_variants_batch(images, workers=None):
+    """Строит варианты для пачки картинок в пуле потоков.
+
+    Pillow отпускает GIL на время кодирования, поэтому потоки грузят все
+    ядра. Возвращает суммарные метрики {(формат, ширина): [картинок,
+    секунд, байт]}.
+    """
+    workers = workers or getattr(settings, 'POSTS_IMAGE_WORKERS', 4)
+
+    def build(image):
+        try:
+            return build_variants(image)
+        except (IOError, OSError) as error:
+            logger.warning('Не удалось обработать %s: %s', image, error)
+            return {}
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(build, images))
+    else:
+        results = [build(image) for image in images]
+    totals = {}
+    for stats in results:
+        merge_totals(totals, {
+            key: (1, seconds, size)
+            for key, (seconds, size) in stats.items()
+        })
+    return totals
+
+
+def merge_totals(totals, batch):
+    for key, (count, seconds, size) in batch.items():
+        total = totals.setdefault(key, [0, 0.0, 0])
+        total[0] += count
+        total[1] += seconds
+        total[2] += size
+    return totals
+
+
+def saving(totals, key):
+    """Доля байт, сэкономленных вариантом относительно запасной картинки."""
+    original = totals.get((ORIGINAL, CARD_WIDTH))
+    if not original or not original[2] or key not in totals:
+        return None
+    return 1 - totals[key][2] / original[2]
+
+
+def log_totals(totals):
+    for key, (count, seconds, size) in sorted(totals.items()):
+        share = saving(totals, key)
+        logger.info(
+            '%s %spx: %s шт., %.3f с, %s байт%s', *key, count, seconds, size,
+            '' if share is None else f', экономия {share:.0%}',
+        )
@@ -0,0 +1,92 @@
+from django.db.models.signals import pre_save, post_save
+from sorl.thumbnail import delete as delete_image
+
+from core.jobs import job, chunked
+from . import counters, images
+from .models import Post, Group, Comment
+
+
+def update_posts(post_ids, **values):
+    """UPDATE одним запросом, если никто не слушает сигналы сохранения."""
+    posts = Post.objects.filter(pk__in=post_ids)
+    if not (pre_save.has_listeners(Post) or post_save.has_listeners(Post)):
+        scopes = counters.affected_scopes(posts)
+        updated = posts.update(**values)
+        counters.invalidate(
+            scopes | counters.affected_scopes(
+                Post.objects.filter(pk__in=post_ids)
+            )
+        )
+        return updated
+    for post in posts:
+        for field, value in values.items():
+            setattr(post, field, value)
+        post.save(update_fields=values.keys())
+    return len(post_ids)
+
+
+@job('posts.reassign_group')
+def reassign_group(current, post_ids, group_id):
+    current.set_total(len(post_ids))
+    for chunk in chunked(post_ids):
+        update_posts(chunk, group_id=group_id)
+        current.advance(len(chunk))
+
+
+@job('posts.delete_posts')
+def delete_posts(current, post_ids):
+    current.set_total(len(post_ids))
+    for chunk in chunked(post_ids):
+        posts = Post.objects.filter(pk__in=chunk)
+        scopes = counters.affected_scopes(posts)
+        # У Comment и Post нет сигналов удаления (posts.signals), поэтому
+        # комментарии удаляются одним DELETE, а области сбрасываются ниже.
+        Comment.objects.filter(post_id__in=chunk).delete()
+        posts.delete()
+        counters.invalidate(scopes)
+        current.advance(len(chunk))
+
+
+@job('posts.purge_images')
+def purge_images(current, post_ids):
+    current.set_total(len(post_ids))
+    for chunk in chunked(post_ids):
+        post_images = (
+            Post.objects.filter(pk__in=chunk).exclude(image='')
+            .values_list('pk', 'image')
+        )
+        with_image = []
+        for pk, name in post_images:
+            delete_image(name)
+            with_image.append(pk)
+        update_posts(
+            with_image, image='', image_sources='', **images.EMPTY_METADATA
+        )
+        current.advance(len(chunk))
+
+
+@job('posts.delete_groups')
+def delete_groups(current, group_ids):
+    current.set_total(len(group_ids))
+    for chunk in chunked(group_ids):
+        post_ids = list(
+            Post.objects.filter(group_id__in=chunk)
+            .values_list('pk', flat=True)
+        )
+        for post_chunk in chunked(post_ids):
+            update_posts(post_chunk, group=None)
+        Group.objects.filter(pk__in=chunk).delete()
+        counters.invalidate(counters.group_scope(pk) for pk in chunk)
+        current.advance(len(chunk))
+
+
+@job('posts.build_image_variants')
+def build_image_variants(current, post_ids):
+    current.set_total(len(post_ids))
+    for chunk in chunked(post_ids):
+        names = list(
+            Post.objects.filter(pk__in=chunk).exclude(image='')
+            .values_list('image', flat=True)
+        )
+        images.log_totals(images.build_variants_batch(names))
+        current.advance(len(chunk))
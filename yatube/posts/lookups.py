@@ -0,0 +1,88 @@
+"""Кеш отрицательных результатов поиска по логину, слагу и id поста.
+
+Краулеры перебирают случайные логины и id, и каждый такой адрес стоил
+нескольких запросов к базе: валидаторы, ключ split-кеша и сама view.
+Отсутствие объекта запоминается в общем кеше на NEGATIVE_LOOKUP_TIMEOUT
+секунд, и повторный адрес отвечает 404 без базы. Удаление
+пользователя или группы создаёт запись, а сохранение объекта на
+PRESENT_TIMEOUT секунд заменяет её меткой присутствия (posts.signals,
+после фиксации транзакции). Запрос, который не нашёл объект до его
+создания, пишет запись через cache.add и не перезапишет эту метку.
+bulk_create сигналов не посылает: такие объекты станут доступны не
+позже, чем истечёт запись.
+
+Метку, поставленную в кеше процесса, не увидят другие воркеры, и
+они отвечали бы 404 на созданный объект. Поэтому без общего кеша
+(core.cache) отсутствие не запоминается.
+
+Фильтр Блума существующих объектов здесь не подходит: биты в общем
+кеше обновлялись бы чтением и записью всего массива, и одновременные
+создания теряли бы биты - живые страницы отвечали бы 404.
+"""
+from functools import wraps
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from core.cache import is_shared
+
+USERNAME = 'username'
+SLUG = 'slug'
+POST = 'post'
+# Сколько секунд метка присутствия не даёт записать отсутствие: дольше,
+# чем идёт запрос от чтения базы до записи в кеш.
+PRESENT_TIMEOUT = 60
+
+
+def missing_key(kind, value):
+    digest = hashlib.md5(str(value).encode()).hexdigest()
+    return f'missing:{kind}:{digest}'
+
+
+def is_missing(kind, value):
+    if not is_shared():
+        return False
+    return cache.get(missing_key(kind, value), False)
+
+
+def mark_missing(kind, value):
+    if is_shared():
+        cache.set(
+            missing_key(kind, value), True, settings.NEGATIVE_LOOKUP_TIMEOUT
+        )
+
+
+def mark_present(kind, value):
+    if is_shared():
+        cache.set(missing_key(kind, value), False, PRESENT_TIMEOUT)
+
+
+def first(kind, value, queryset):
+    """queryset.first(); пустой результат запоминается."""
+    obj = queryset.first()
+    if obj is None and is_shared():
+        cache.add(
+            missing_key(kind, value), True, settings.NEGATIVE_LOOKUP_TIMEOUT
+        )
+    return obj
+
+
+def get_or_404(kind, value, queryset):
+    obj = first(kind, value, queryset)
+    if obj is None:
+        raise Http404
+    return obj
+
+
+def reject_missing(kind, kwarg):
+    """404 до вызова view, если объект из kwargs[kwarg] уже не нашли."""
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if is_missing(kind, kwargs[kwarg]):
+                raise Http404
+            return view(request, *args, **kwargs)
+        return inner
+    return decorator
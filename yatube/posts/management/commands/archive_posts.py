@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from posts.archive import archive_old_posts, DEFAULT_ARCHIVE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые посты и их комментарии в архивные таблицы'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Возраст постов в днях (по умолчанию '
+                 'POSTS_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_ARCHIVE_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        total = archive_old_posts(options['days'], options['batch_size'])
+        self.stdout.write(f'Перенесено в архив постов: {total}')
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import counters, images
+from posts.models import IMAGE_METADATA_FIELDS, Post
+
+DEFAULT_BACKFILL_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет метаданные картинок (размеры, формат, размер файла, '
+        'хеш, заглушку) у постов, загруженных до их появления'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BACKFILL_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Потоков для чтения файлов (по умолчанию '
+                 'POSTS_IMAGE_WORKERS)',
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересчитать метаданные у всех постов с картинкой',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='')
+        if not options['all']:
+            posts = posts.filter(image_hash='')
+        workers = options['workers'] or settings.POSTS_IMAGE_WORKERS
+        total = 0
+        last_pk = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                # Пагинация по ключу: строки с нечитаемыми файлами
+                # остаются без хеша, но не выбираются повторно.
+                batch = list(
+                    posts.filter(pk__gt=last_pk).order_by('pk')
+                    .values_list('pk', 'image')[:options['batch_size']]
+                )
+                if not batch:
+                    break
+                last_pk = batch[-1][0]
+                metadata = executor.map(
+                    images.read_stored_metadata, [name for _, name in batch]
+                )
+                Post.objects.bulk_update(
+                    [
+                        Post(pk=pk, **values)
+                        for (pk, _), values in zip(batch, metadata)
+                    ],
+                    IMAGE_METADATA_FIELDS,
+                )
+                # Заглушки выводятся в ленте, поэтому кеш страниц сбрасываем.
+                counters.invalidate(counters.affected_scopes(
+                    Post.objects.filter(pk__in=[pk for pk, _ in batch])
+                ))
+                total += len(batch)
+                self.stdout.write(f'Обработано постов: {total}')
@@ -0,0 +1,118 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.loader import get_template
+from django.test import RequestFactory
+from django.urls import resolve
+
+from posts.forms import CommentForm
+from posts.models import Post, Group, Comment, User
+from posts.utils import NUMBER_OF_POSTS, get_page_obj
+
+BENCH_USERNAME = 'bench-template-author'
+BENCH_GROUP_SLUG = 'bench-template-group'
+BENCH_POSTS = 3 * NUMBER_OF_POSTS
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время рендера шаблонов для каждого типа страниц'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument(
+            '--authenticated', action='store_true',
+            help='Рендерить страницы для авторизованного пользователя',
+        )
+
+    def handle(self, *args, **options):
+        # Тестовые данные создаются в транзакции и откатываются в конце.
+        with transaction.atomic():
+            author, pages = self.build_pages()
+            user = author if options['authenticated'] else AnonymousUser()
+            self.stdout.write(
+                f'{"страница":<14}{"первый, мс":>12}{"среднее, мс":>13}'
+                f'{"мин, мс":>10}'
+            )
+            for name, (url, template_name, context) in pages.items():
+                request = RequestFactory().get(url)
+                request.user = user
+                request.resolver_match = resolve(url)
+                first, mean, best = self.measure(
+                    template_name, context, request, options['iterations']
+                )
+                self.stdout.write(
+                    f'{name:<14}{first:>12.3f}{mean:>13.3f}{best:>10.3f}'
+                )
+            transaction.set_rollback(True)
+
+    def build_pages(self):
+        author = User.objects.create_user(username=BENCH_USERNAME)
+        group = Group.objects.create(
+            title='Benchmark', slug=BENCH_GROUP_SLUG, description='-'
+        )
+        Post.objects.bulk_create(
+            Post(author=author, group=group, text=f'Benchmark post {i}')
+            for i in range(BENCH_POSTS)
+        )
+        post = Post.objects.filter(author=author).first()
+        Comment.objects.bulk_create(
+            Comment(post=post, author=author, text=f'Comment {i}')
+            for i in range(NUMBER_OF_POSTS)
+        )
+        request = RequestFactory().get('/')
+
+        def page(post_list):
+            page_obj = get_page_obj(request, post_list.select_related(
+                'author', 'group'
+            ))
+            # Запросы к базе выполняются до замера рендера.
+            page_obj.object_list = list(page_obj.object_list)
+            return page_obj
+
+        pages = {
+            'index': (
+                '/', 'posts/index.html',
+                {'page_obj': page(Post.objects.all())},
+            ),
+            'group_list': (
+                f'/group/{group.slug}/', 'posts/group_list.html',
+                {'group': group, 'page_obj': page(group.posts.all())},
+            ),
+            'profile': (
+                f'/profile/{author.username}/', 'posts/profile.html',
+                {
+                    'user_profile': author,
+                    'page_obj': page(author.posts.all()),
+                },
+            ),
+            'post_detail': (
+                f'/posts/{post.pk}/', 'posts/post_detail.html',
+                {
+                    'post': post,
+                    'form': CommentForm(),
+                    'comments': list(
+                        post.comments.select_related('author')
+                    ),
+                },
+            ),
+            'about': ('/about/author/', 'about/author.html', {}),
+        }
+        return author, pages
+
+    def measure(self, template_name, context, request, iterations):
+        start = time.perf_counter()
+        template = get_template(template_name)
+        template.render(context, request)
+        first = time.perf_counter() - start
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            get_template(template_name).render(context, request)
+            timings.append(time.perf_counter() - start)
+        return (
+            first * 1000,
+            sum(timings) / len(timings) * 1000,
+            min(timings) * 1000,
+        )
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from core.urlbuilder import build
+
+# Маршруты карточек и шапки с типичными аргументами.
+ROUTES = (
+    ('posts:index', ()),
+    ('posts:post_create', ()),
+    ('about:author', ()),
+    ('users:login', ()),
+    ('posts:profile', ('bench-author', )),
+    ('posts:group_list', ('bench-group', )),
+    ('posts:post_detail', (12345, )),
+    ('posts:add_comment', (12345, )),
+)
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает reverse() и core.urlbuilder.build() по маршрутам'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        self.stdout.write(
+            f'{"маршрут":<20}{"reverse, мкс":>14}{"build, мкс":>12}'
+            f'{"ускорение":>11}'
+        )
+        for viewname, route_args in ROUTES:
+            if build(viewname, *route_args) != reverse(
+                viewname, args=route_args
+            ):
+                raise CommandError(f'{viewname}: адреса не совпадают')
+            slow = self.measure(
+                lambda: reverse(viewname, args=route_args), iterations
+            )
+            fast = self.measure(
+                lambda: build(viewname, *route_args), iterations
+            )
+            self.stdout.write(
+                f'{viewname:<20}{slow:>14.2f}{fast:>12.2f}'
+                f'{slow / fast:>10.1f}x'
+            )
+
+    def measure(self, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1e6
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from posts import images
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Строит WebP/AVIF варианты картинок постов и выводит метрики'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None)
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Сколько картинок отдавать пулу за раз',
+        )
+
+    def handle(self, *args, **options):
+        names = list(
+            Post.objects.exclude(image='').order_by('pk')
+            .values_list('image', flat=True)
+        )
+        totals = {}
+        batch_size = options['batch_size']
+        for start in range(0, len(names), batch_size):
+            images.merge_totals(totals, images.build_variants_batch(
+                names[start:start + batch_size], options['workers']
+            ))
+            self.stdout.write(
+                f'Обработано {min(start + batch_size, len(names))} '
+                f'из {len(names)}'
+            )
+        self.stdout.write(
+            f'{"формат":<10}{"ширина":>8}{"картинок":>10}{"мс/шт":>9}'
+            f'{"КБ/шт":>9}{"экономия":>10}'
+        )
+        for key, (count, seconds, size) in sorted(totals.items()):
+            share = images.saving(totals, key)
+            self.stdout.write(
+                f'{key[0]:<10}{key[1]:>8}{count:>10}'
+                f'{seconds / count * 1000:>9.1f}{size / count / 1024:>9.1f}'
+                f'{"-" if share is None else f"{share:.0%}":>10}'
+            )
@@ -0,0 +1,46 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import export
+from posts.models import User
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты и комментарии пользователя в zip или NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument(
+            '--format', choices=export.FORMATS, default='zip',
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для выгрузки (по умолчанию <username>-export.<format>,'
+                 ' "-" - стандартный вывод)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError('Пользователь не найден.')
+        export_format = options['format']
+        output = options['output'] or export.filename(author, export_format)
+        if output == '-':
+            self.write_chunks(
+                sys.stdout.buffer, export.export(author, export_format)
+            )
+            return
+        with open(output, 'wb') as file:
+            written = self.write_chunks(
+                file, export.export(author, export_format)
+            )
+        self.stdout.write(f'Записано {written} байт в {output}')
+
+    def write_chunks(self, file, chunks):
+        written = 0
+        for chunk in chunks:
+            file.write(chunk)
+            written += len(chunk)
+        return written
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_auto_20230210_1259'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='pub_date',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата публикации'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 2.2.28 on 2026-10-19 17:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0009_auto_20261019_1748'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPost',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('text', models.TextField(verbose_name='Текст поста')),
+                ('pub_date', models.DateTimeField(db_index=True, verbose_name='Дата публикации')),
+                ('image', models.ImageField(blank=True, upload_to='posts/', verbose_name='Картинка')),
+                ('archived', models.DateTimeField(auto_now_add=True, verbose_name='Дата архивации')),
+                ('author', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_posts', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('group', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_posts', to='posts.Group', verbose_name='Группа')),
+            ],
+            options={
+                'verbose_name': 'Архивный пост',
+                'verbose_name_plural': 'Архивные посты',
+                'ordering': ('-pub_date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('text', models.TextField(verbose_name='Текст комментария')),
+                ('created', models.DateTimeField(verbose_name='Дата комментария')),
+                ('author', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_comments', to=settings.AUTH_USER_MODEL, verbose_name='Имя автора')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='posts.ArchivedPost', verbose_name='Имя поста')),
+            ],
+            options={
+                'verbose_name': 'Архивный комментарий',
+                'verbose_name_plural': 'Архивные комментарии',
+                'ordering': ('-created',),
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.28 on 2026-10-19 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_format',
+            field=models.CharField(blank=True, editable=False, max_length=10, verbose_name='Формат картинки'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='SHA-256 картинки'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_size',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Размер картинки, байт'),
+        ),
+    ]
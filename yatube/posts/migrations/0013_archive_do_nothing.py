@@ -0,0 +1,30 @@
+# Generated by Django 2.2.28 on 2026-10-19 18:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_image_file_metadata'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedcomment',
+            name='author',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_comments', to=settings.AUTH_USER_MODEL, verbose_name='Имя автора'),
+        ),
+        migrations.AlterField(
+            model_name='archivedpost',
+            name='author',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_posts', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+        ),
+        migrations.AlterField(
+            model_name='archivedpost',
+            name='group',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_posts', to='posts.Group', verbose_name='Группа'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_archive_do_nothing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_sources',
+            field=models.TextField(blank=True, editable=False, verbose_name='Варианты картинки'),
+        ),
+    ]
@@ -1,8 +1,16 @@
-from django.db import models
+from functools import partial
+
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 
+from core.urlbuilder import build
+from . import counters, images, lookups
+
 TITLE_MAX_LENGTH = 200
 STR_DISPLAYED_CHAR = 15
+IMAGE_METADATA_FIELDS = tuple(images.EMPTY_METADATA)
+# Поля, которые сбрасываются при смене картинки.
+IMAGE_FIELDS = IMAGE_METADATA_FIELDS + ('image_sources', )
 
 User = get_user_model()
 
@@ -15,6 +23,13 @@ class Group(models.Model):
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return build('posts:group_list', self.slug)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        counters.bump([counters.group_scope(self.pk), counters.SCOPE_GROUPS])
+
 
 class Post(models.Model):
     text = models.TextField(
@@ -23,7 +38,8 @@ class Post(models.Model):
     )
     pub_date = models.DateTimeField(
         'Дата публикации',
-        auto_now_add=True
+        auto_now_add=True,
+        db_index=True,
     )
     author = models.ForeignKey(
         User,
@@ -45,6 +61,33 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    # Метаданные картинки заполняются при загрузке, чтобы шаблоны не
+    # открывали файл. width_field/height_field не используются: для строк
+    # без размеров Django открывал бы файл при каждой загрузке модели.
+    image_width = models.PositiveIntegerField(
+        'Ширина картинки', null=True, blank=True, editable=False
+    )
+    image_height = models.PositiveIntegerField(
+        'Высота картинки', null=True, blank=True, editable=False
+    )
+    image_format = models.CharField(
+        'Формат картинки', max_length=10, blank=True, editable=False
+    )
+    image_size = models.PositiveIntegerField(
+        'Размер картинки, байт', null=True, blank=True, editable=False
+    )
+    image_hash = models.CharField(
+        'SHA-256 картинки', max_length=64, blank=True, editable=False,
+        db_index=True,
+    )
+    image_placeholder = models.TextField(
+        'Заглушка картинки', blank=True, editable=False
+    )
+    # JSON с srcset вариантов (posts.images.build_variants); пусто, пока
+    # фоновая задача их не построила.
+    image_sources = models.TextField(
+        'Варианты картинки', blank=True, editable=False
+    )
 
     class Meta:
         ordering = ('-pub_date', )
@@ -52,6 +95,63 @@ class Post(models.Model):
     def __str__(self):
         return self.text[:STR_DISPLAYED_CHAR]
 
+    def get_absolute_url(self):
+        return build('posts:post_detail', self.pk)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        post = super().from_db(db, field_names, values)
+        post._loaded_group_id = post.__dict__.get('group_id')
+        image = post.__dict__.get('image')
+        post._loaded_image = getattr(image, 'name', image)
+        return post
+
+    @property
+    def image_info(self):
+        return images.image_info(self)
+
+    def update_image_metadata(self):
+        if self.image:
+            metadata = images.read_metadata(self.image)
+        else:
+            metadata = images.EMPTY_METADATA
+        for field, value in metadata.items():
+            setattr(self, field, value)
+        self.image_sources = ''
+
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        image_changed = self.image.name != getattr(self, '_loaded_image', None)
+        if image_changed and (
+            update_fields is None or 'image' in update_fields
+        ):
+            self.update_image_metadata()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields).union(
+                    IMAGE_FIELDS
+                )
+        super().save(*args, **kwargs)
+        self._loaded_image = self.image.name
+        if created:
+            counters.post_created(self)
+            # Не сигналом post_save: слушатель сигнала выключил бы
+            # UPDATE одним запросом в posts.jobs.update_posts.
+            transaction.on_commit(
+                partial(lookups.mark_present, lookups.POST, self.pk)
+            )
+        else:
+            counters.post_changed(
+                self, getattr(self, '_loaded_group_id', self.group_id)
+            )
+        self._loaded_group_id = self.group_id
+
+    def delete(self, *args, **kwargs):
+        post_id = self.pk
+        result = super().delete(*args, **kwargs)
+        counters.post_deleted(self, post_id)
+        return result
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -81,6 +181,15 @@ class Comment(models.Model):
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        counters.bump([counters.post_scope(self.post_id)])
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        counters.bump([counters.post_scope(self.post_id)])
+        return result
+
 
 class Follow(models.Model):
     user = models.ForeignKey(
@@ -102,4 +211,71 @@ class Follow(models.Model):
         verbose_name_plural = 'Подписки'
 
     def __str__(self):
-        return f'{self.user} following {self.author}'
\ No newline at end of file
+        return f'{self.user} following {self.author}'
+
+
+class ArchivedPost(models.Model):
+    # Первичный ключ совпадает с id исходного поста, чтобы старые
+    # ссылки на post_detail продолжали работать. Архив может лежать в
+    # другой базе (POSTS_ARCHIVE_DATABASE), поэтому связи с авторами и
+    # группами без ограничений и каскадов: при их удалении архив
+    # чистит posts.signals.
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField('Текст поста')
+    pub_date = models.DateTimeField('Дата публикации', db_index=True)
+    author = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='archived_posts',
+        verbose_name='Автор',
+    )
+    group = models.ForeignKey(
+        'Group',
+        blank=True,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='archived_posts',
+        verbose_name='Группа',
+    )
+    image = models.ImageField('Картинка', upload_to='posts/', blank=True)
+    archived = models.DateTimeField('Дата архивации', auto_now_add=True)
+
+    class Meta:
+        ordering = ('-pub_date', )
+        verbose_name = 'Архивный пост'
+        verbose_name_plural = 'Архивные посты'
+
+    def __str__(self):
+        return self.text[:STR_DISPLAYED_CHAR]
+
+    def get_absolute_url(self):
+        return build('posts:post_detail', self.pk)
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name='Имя поста',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='archived_comments',
+        verbose_name='Имя автора',
+    )
+    text = models.TextField('Текст комментария')
+    created = models.DateTimeField('Дата комментария')
+
+    class Meta:
+        ordering = ('-created', )
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
+
+    def __str__(self):
+        return self.text
@@ -0,0 +1,37 @@
+from django.conf import settings
+
+ARCHIVE_MODELS = {'archivedpost', 'archivedcomment'}
+
+
+class ArchiveRouter:
+    """Выносит архивные таблицы в отдельную базу POSTS_ARCHIVE_DATABASE."""
+
+    def _archive_db(self):
+        return getattr(settings, 'POSTS_ARCHIVE_DATABASE', None)
+
+    def _is_archive(self, model):
+        # Модель или экземпляр: у обоих есть _meta.
+        return (
+            model._meta.app_label == 'posts'
+            and model._meta.model_name in ARCHIVE_MODELS
+        )
+
+    def db_for_read(self, model, **hints):
+        if self._is_archive(model):
+            return self._archive_db()
+        return None
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if self._is_archive(obj1) or self._is_archive(obj2):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        archive_db = self._archive_db()
+        if archive_db is None or app_label != 'posts':
+            return None
+        if model_name in ARCHIVE_MODELS:
+            return db == archive_db
+        return db != archive_db
@@ -0,0 +1,108 @@
+"""Сериализация постов и комментариев для JSON API без создания моделей.
+
+Запросы строятся через values() только с нужными колонками, а словари
+строк превращаются в JSON-объекты функциями ниже. Данные картинки
+берутся из колонок Post.image_*, файлы не открываются.
+"""
+import base64
+
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Comment
+
+POST_FIELDS = (
+    'id',
+    'text',
+    'pub_date',
+    'author__username',
+    'group__slug',
+    'image',
+    'image_width',
+    'image_height',
+    'image_format',
+    'image_size',
+    'image_hash',
+    'image_placeholder',
+)
+COMMENT_FIELDS = ('id', 'text', 'created', 'author__username')
+FEED_ORDERING = ('-pub_date', '-id')
+
+
+def post_rows(queryset):
+    return queryset.order_by(*FEED_ORDERING).values(*POST_FIELDS)
+
+
+def comment_rows(post_id):
+    return Comment.objects.filter(post_id=post_id).order_by(
+        '-created', '-id'
+    ).values(*COMMENT_FIELDS)
+
+
+def serialize_image(row):
+    if not row['image']:
+        return None
+    return {
+        'url': default_storage.url(row['image']),
+        'width': row['image_width'],
+        'height': row['image_height'],
+        'format': row['image_format'] or None,
+        'size': row['image_size'],
+        'hash': row['image_hash'] or None,
+        'placeholder': row['image_placeholder'] or None,
+    }
+
+
+def serialize_post(row):
+    return {
+        'id': row['id'],
+        'text': row['text'],
+        'pub_date': row['pub_date'].isoformat(),
+        'author': row['author__username'],
+        'group': row['group__slug'],
+        'image': serialize_image(row),
+    }
+
+
+def serialize_comment(row):
+    return {
+        'id': row['id'],
+        'text': row['text'],
+        'created': row['created'].isoformat(),
+        'author': row['author__username'],
+    }
+
+
+def encode_cursor(row):
+    value = f'{row["pub_date"].isoformat()}|{row["id"]}'
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(pub_date, id) из курсора; ValueError для испорченного курсора."""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    pub_date, post_id = base64.urlsafe_b64decode(
+        padded.encode()
+    ).decode().split('|')
+    pub_date = parse_datetime(pub_date)
+    if pub_date is None:
+        raise ValueError(cursor)
+    return pub_date, int(post_id)
+
+
+def after_cursor(queryset, cursor):
+    """Посты строго после курсора в порядке FEED_ORDERING."""
+    pub_date, post_id = decode_cursor(cursor)
+    return queryset.filter(
+        Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=post_id)
+    )
+
+
+def cursor_page(queryset, cursor=None, limit=10):
+    """Страница постов и курсор следующей страницы (или None)."""
+    if cursor:
+        queryset = after_cursor(queryset, cursor)
+    rows = list(post_rows(queryset)[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return [serialize_post(row) for row in rows[:limit]], next_cursor
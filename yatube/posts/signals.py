@@ -0,0 +1,111 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import counters, lookups
+from .models import (
+    User, Group, Comment, Follow, ArchivedPost, ArchivedComment,
+)
+
+
+@receiver(post_save, sender=User, dispatch_uid='posts_bump_author_scope')
+def bump_author_scope(sender, instance, **kwargs):
+    # Имя и логин автора выводятся на его страницах и в карточках постов.
+    counters.bump([counters.author_scope(instance.pk)])
+
+
+# У Post и Comment нет сигналов удаления: с ними collector выбирал бы
+# каждую строку вместо одного DELETE. Счётчики обновляют Post.delete()
+# и Comment.delete(), массовые удаления (posts.jobs, posts.archive,
+# админка) сбрасывают области сами, а каскады от групп и пользователей
+# обрабатываются ниже.
+@receiver(pre_delete, sender=Group, dispatch_uid='posts_group_scopes')
+def remember_group_scopes(sender, instance, **kwargs):
+    # Посты группы отвязываются UPDATE без сигналов, поэтому их области
+    # собираются до удаления.
+    instance._affected_scopes = counters.affected_scopes(instance.posts.all())
+
+
+@receiver(post_delete, sender=Group, dispatch_uid='posts_group_deleted')
+def group_deleted(sender, instance, **kwargs):
+    scopes = getattr(instance, '_affected_scopes', set())
+    counters.invalidate(scopes | {counters.group_scope(instance.pk)})
+
+
+@receiver(pre_delete, sender=User, dispatch_uid='posts_follower_scopes')
+def remember_follower_scopes(sender, instance, **kwargs):
+    instance._follower_ids = list(
+        Follow.objects.filter(author=instance).values_list(
+            'user_id', flat=True
+        )
+    )
+    # Посты и комментарии пользователя удаляются каскадом без сигналов.
+    instance._deleted_posts = list(
+        instance.posts.order_by().values_list('pk', 'author_id', 'group_id')
+    )
+    instance._commented_post_ids = set(
+        Comment.objects.filter(author=instance).values_list(
+            'post_id', flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=User, dispatch_uid='posts_author_deleted')
+def author_deleted(sender, instance, **kwargs):
+    counters.posts_deleted(getattr(instance, '_deleted_posts', ()))
+    counters.bump(
+        counters.post_scope(post_id)
+        for post_id in getattr(instance, '_commented_post_ids', ())
+    )
+    counters.invalidate(
+        [counters.author_scope(instance.pk),
+         counters.follow_scope(instance.pk)]
+        + [
+            counters.follow_scope(user_id)
+            for user_id in getattr(instance, '_follower_ids', ())
+        ]
+    )
+
+
+# Метки ставятся после фиксации транзакции: до неё другие запросы
+# ещё видят прежнее состояние базы.
+@receiver(post_save, sender=User, dispatch_uid='posts_user_present')
+def user_present(sender, instance, **kwargs):
+    transaction.on_commit(
+        partial(lookups.mark_present, lookups.USERNAME, instance.username)
+    )
+
+
+@receiver(post_delete, sender=User, dispatch_uid='posts_user_missing')
+def user_missing(sender, instance, **kwargs):
+    transaction.on_commit(
+        partial(lookups.mark_missing, lookups.USERNAME, instance.username)
+    )
+
+
+@receiver(post_save, sender=Group, dispatch_uid='posts_group_present')
+def group_present(sender, instance, **kwargs):
+    transaction.on_commit(
+        partial(lookups.mark_present, lookups.SLUG, instance.slug)
+    )
+
+
+@receiver(post_delete, sender=Group, dispatch_uid='posts_group_missing')
+def group_missing(sender, instance, **kwargs):
+    transaction.on_commit(
+        partial(lookups.mark_missing, lookups.SLUG, instance.slug)
+    )
+
+
+@receiver(post_delete, sender=User, dispatch_uid='posts_archive_user')
+def delete_archived_by_author(sender, instance, **kwargs):
+    # Запросы к архиву идут в его базу через posts.routers.
+    ArchivedComment.objects.filter(author_id=instance.pk).delete()
+    ArchivedPost.objects.filter(author_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=Group, dispatch_uid='posts_archive_group')
+def detach_archived_group(sender, instance, **kwargs):
+    ArchivedPost.objects.filter(group_id=instance.pk).update(group=None)
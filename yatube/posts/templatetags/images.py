@@ -0,0 +1,37 @@
+import logging
+
+from django import template
+from sorl.thumbnail.conf import settings as thumbnail_settings
+
+from posts.images import CARD_HEIGHT, CARD_WIDTH, image_info, picture_sources
+
+logger = logging.getLogger(__name__)
+register = template.Library()
+
+FEED_SIZES = '(max-width: 960px) 100vw, 960px'
+
+
+@register.inclusion_tag('posts/includes/picture.html')
+def picture(post, eager=False, sizes=FEED_SIZES, css_class='card-img my-2'):
+    """<picture> для картинки поста по колонкам Post.image_*."""
+    info = image_info(post)
+    if info is None:
+        return {}
+    try:
+        sources, fallback_url = picture_sources(info)
+    except Exception:
+        # Как и {% thumbnail %}: битая картинка не должна ронять страницу.
+        if thumbnail_settings.THUMBNAIL_DEBUG:
+            raise
+        logger.exception('Не удалось построить варианты %s', info.name)
+        return {}
+    return {
+        'sources': sources,
+        'fallback_url': fallback_url,
+        'placeholder': info.placeholder,
+        'eager': eager,
+        'width': CARD_WIDTH,
+        'height': CARD_HEIGHT,
+        'sizes': sizes,
+        'css_class': css_class,
+    }
@@ -0,0 +1,10 @@
+from django import template
+
+from posts.utils import get_page_window, PAGES_ON_EACH_SIDE
+
+register = template.Library()
+
+
+@register.simple_tag
+def page_window(page_obj, on_each_side=PAGES_ON_EACH_SIDE):
+    return get_page_window(page_obj, on_each_side)
@@ -0,0 +1,9 @@
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class SharedLocMemCache(LocMemCache):
+    """LocMemCache, который core.cache.is_shared считает общим.
+
+    В тестах все запросы идут в одном процессе, так что механизмы,
+    которым нужен общий кеш, можно проверять на памяти процесса.
+    """
@@ -43,3 +43,7 @@ TEMPLATE_GROUP = 'posts/group_list.html'
 TEMPLATE_PROFILE = 'posts/profile.html'
 TEMPLATE_POST_DETAIL = 'posts/post_detail.html'
 TEMPLATE_POST_CREATE = 'posts/create_post.html'
+
+SHARED_CACHES = {
+    'default': {'BACKEND': 'posts.tests.cache.SharedLocMemCache'},
+}
@@ -0,0 +1,163 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.jobs import run_job
+from core.models import Job
+from . import constants as c
+from ..models import User, Group, Post, Comment
+from ..utils import EstimatedCountPaginator
+
+URL_ADMIN_POSTS = 'admin:posts_post_changelist'
+
+
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username=c.USERNAME,
+            email='admin@example.com',
+            password='password',
+        )
+        cls.group = Group.objects.create(
+            title=c.GROUP_TITLE,
+            slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+        cls.another_group = Group.objects.create(
+            title=c.ANOTHER_GROUP_TITLE,
+            slug=c.ANOTHER_GROUP_SLUG,
+            description=c.ANOTHER_GROUP_DESCRIPTION,
+        )
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(reverse(URL_ADMIN_POSTS))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка постов не зависит от числа строк."""
+        Post.objects.create(author=self.admin, text=c.POST_TEXT)
+        few_rows = self.changelist_queries()
+        Post.objects.bulk_create(
+            Post(
+                author=User.objects.create_user(username=f'user{i}'),
+                text=f'{c.POST_TEXT} {i}',
+                group=self.group if i % 2 else self.another_group,
+            )
+            for i in range(10)
+        )
+        self.assertEqual(self.changelist_queries(), few_rows)
+
+    def test_search_by_author_username(self):
+        """Поиск в админке по логину автора."""
+        post = Post.objects.create(author=self.admin, text=c.POST_TEXT)
+        response = self.admin_client.get(
+            reverse(URL_ADMIN_POSTS), {'q': self.admin.username}
+        )
+        self.assertIn(post, response.context['cl'].result_list)
+
+    def test_search_by_username_keeps_text_matches(self):
+        """Поиск по логину находит и посты с этим словом в тексте."""
+        author = User.objects.create_user(username=c.VIEWER_USERNAME)
+        by_author = Post.objects.create(author=author, text=c.POST_TEXT)
+        by_text = Post.objects.create(
+            author=self.admin, text=f'{c.POST_TEXT} {author.username}'
+        )
+        response = self.admin_client.get(
+            reverse(URL_ADMIN_POSTS), {'q': author.username}
+        )
+        result_list = response.context['cl'].result_list
+        self.assertIn(by_author, result_list)
+        self.assertIn(by_text, result_list)
+
+    def test_paginator_exact_count_without_estimate(self):
+        """Без оценки планировщика (SQLite) число строк точное."""
+        post = Post.objects.create(author=self.admin, text=c.POST_TEXT)
+        Post.objects.create(author=self.admin, text=c.POST_TEXT)
+        post.delete()
+        paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+        paginator.exact_count_threshold = 0
+        self.assertEqual(paginator.count, 1)
+
+
+@override_settings(JOBS_ALWAYS_EAGER=True, JOBS_CHUNK_SIZE=2)
+class PostAdminActionsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username=c.USERNAME,
+            email='admin@example.com',
+            password='password',
+        )
+        cls.group = Group.objects.create(
+            title=c.GROUP_TITLE,
+            slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+        Post.objects.bulk_create(
+            Post(author=self.admin, text=f'{c.POST_TEXT} {i}')
+            for i in range(5)
+        )
+        self.post_ids = list(Post.objects.values_list('pk', flat=True))
+
+    def run_action(self, action, **data):
+        return self.admin_client.post(
+            reverse(URL_ADMIN_POSTS),
+            {'action': action, '_selected_action': self.post_ids, **data},
+        )
+
+    def test_reassign_group(self):
+        """Фоновый перенос постов в группу."""
+        self.run_action('reassign_group', group=self.group.pk)
+        self.assertEqual(
+            Post.objects.filter(group=self.group).count(),
+            len(self.post_ids),
+        )
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.progress, 100)
+
+    @override_settings(JOBS_ALWAYS_EAGER=False)
+    def test_reassign_group_updates_chunks(self):
+        """Посты переносятся одним UPDATE на пачку, а не по одному."""
+        self.run_action('reassign_group', group=self.group.pk)
+        job = Job.objects.get()
+        # Захват, число постов и итог задачи; на каждую из трёх пачек -
+        # области до и после UPDATE, сам UPDATE и прогресс.
+        with self.assertNumQueries(3 + 3 * 4):
+            run_job(job)
+        self.assertEqual(
+            Post.objects.filter(group=self.group).count(),
+            len(self.post_ids),
+        )
+
+    def test_delete_in_background(self):
+        """Фоновое удаление постов вместе с комментариями."""
+        Comment.objects.create(
+            post_id=self.post_ids[0], author=self.admin, text=c.COMMENT_TEXT
+        )
+        self.run_action('delete_in_background')
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+
+    @override_settings(JOBS_ALWAYS_EAGER=False)
+    def test_action_only_enqueues_job(self):
+        """Без eager-режима действие только ставит задачу в очередь."""
+        self.run_action('delete_in_background')
+        self.assertEqual(Post.objects.count(), len(self.post_ids))
+        self.assertEqual(Job.objects.get().status, Job.PENDING)
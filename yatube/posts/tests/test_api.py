@@ -0,0 +1,111 @@
+import json
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import constants as c
+from ..models import User, Group, Post, Comment, Follow
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=c.USERNAME)
+        cls.viewer = User.objects.create_user(username=c.VIEWER_USERNAME)
+        cls.group = Group.objects.create(
+            title=c.GROUP_TITLE,
+            slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'{c.POST_TEXT} {i}')
+            for i in range(15)
+        )
+        cls.post = Post.objects.order_by('-pub_date', '-id').first()
+        Comment.objects.create(
+            post=cls.post, author=cls.viewer, text=c.COMMENT_TEXT
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.viewer_client = Client()
+        self.viewer_client.force_login(self.viewer)
+
+    def test_cursor_pagination_walks_whole_feed(self):
+        """Курсор проходит ленту без повторов и пропусков."""
+        url = reverse('api:index')
+        seen = []
+        params = {'limit': 4}
+        while url:
+            data = self.guest_client.get(url, params).json()
+            seen += [post['id'] for post in data['results']]
+            url, params = data['next'], {}
+        expected = list(
+            Post.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_feeds(self):
+        """Ленты группы, автора и подписок."""
+        Follow.objects.create(user=self.viewer, author=self.author)
+        urls = (
+            reverse('api:group_posts', args=(self.group.slug, )),
+            reverse('api:profile_posts', args=(self.author.username, )),
+            reverse('api:follow_posts'),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                data = self.viewer_client.get(url).json()
+                self.assertEqual(len(data['results']), 10)
+                self.assertEqual(data['results'][0]['author'], c.USERNAME)
+                self.assertEqual(data['results'][0]['group'], c.GROUP_SLUG)
+
+    def test_feed_does_not_instantiate_models(self):
+        """Страница ленты - один запрос постов с join автора и группы."""
+        with CaptureQueriesContext(connection) as queries:
+            self.guest_client.get(reverse('api:index'))
+        post_queries = [
+            q for q in queries if 'FROM "posts_post"' in q['sql']
+        ]
+        self.assertEqual(len(post_queries), 1)
+
+    def test_post_detail_with_comments(self):
+        """Пост отдаётся вместе с комментариями."""
+        data = self.guest_client.get(
+            reverse('api:post_detail', args=(self.post.pk, ))
+        ).json()
+        self.assertEqual(data['id'], self.post.pk)
+        self.assertEqual(data['comments'][0]['text'], c.COMMENT_TEXT)
+        self.assertIsNone(data['image'])
+
+    def test_ndjson_stream(self):
+        """С format=ndjson лента отдаётся потоком по посту на строку."""
+        response = self.guest_client.get(
+            reverse('api:index'), {'format': 'ndjson'}
+        )
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), Post.objects.count())
+        self.assertEqual(json.loads(lines[0])['id'], self.post.pk)
+
+    def test_errors(self):
+        """Ошибки отдаются в JSON с нужным кодом."""
+        cases = (
+            (reverse('api:index'), {'cursor': 'broken'},
+             HTTPStatus.BAD_REQUEST),
+            (reverse('api:group_posts', args=('missing', )), {},
+             HTTPStatus.NOT_FOUND),
+            (reverse('api:follow_posts'), {}, HTTPStatus.UNAUTHORIZED),
+        )
+        for url, params, status in cases:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url, params)
+                self.assertEqual(response.status_code, status)
+                self.assertIn('detail', response.json())
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import constants as c
+from .. import counters
+from ..models import (
+    User, Group, Post, Comment, ArchivedPost, ArchivedComment,
+)
+
+
+@override_settings(CACHES=c.SHARED_CACHES)
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=c.USERNAME)
+        cls.old_post = Post.objects.create(author=cls.user, text=c.POST_TEXT)
+        cls.comment = Comment.objects.create(
+            post=cls.old_post, author=cls.user, text=c.COMMENT_TEXT
+        )
+        Post.objects.filter(pk=cls.old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        cls.new_post = Post.objects.create(
+            author=cls.user, text=c.ANOTHER_POST_TEXT
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_archive_moves_old_posts_with_comments(self):
+        """Старые посты и их комментарии переезжают в архив."""
+        call_command(
+            'archive_posts', days=365, batch_size=1, stdout=StringIO()
+        )
+        self.assertFalse(Post.objects.filter(pk=self.old_post.pk).exists())
+        self.assertTrue(Post.objects.filter(pk=self.new_post.pk).exists())
+        self.assertFalse(Comment.objects.exists())
+        archived = ArchivedPost.objects.get(pk=self.old_post.pk)
+        self.assertEqual(archived.text, c.POST_TEXT)
+        self.assertEqual(archived.author, self.user)
+        self.assertEqual(
+            ArchivedComment.objects.get().post_id, self.old_post.pk
+        )
+
+    def test_archived_post_detail_still_readable(self):
+        """Архивный пост открывается по прежнему адресу."""
+        call_command('archive_posts', days=365, stdout=StringIO())
+        response = self.guest_client.get(
+            reverse(c.URL_POST_DETAIL, args=(self.old_post.pk,))
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.context['is_archived'])
+        self.assertEqual(response.context['post'].text, c.POST_TEXT)
+        self.assertEqual(len(response.context['comments']), 1)
+
+    def test_feed_contains_only_hot_posts(self):
+        """Главная страница показывает только неархивные посты."""
+        call_command('archive_posts', days=365, stdout=StringIO())
+        response = self.guest_client.get(reverse(c.URL_INDEX))
+        self.assertEqual(
+            list(response.context['page_obj']), [self.new_post]
+        )
+
+    def test_archive_invalidates_counts(self):
+        """Перенос в архив сбрасывает счётчики затронутых лент."""
+        counters.set_cached_count(counters.SCOPE_ALL, 2)
+        call_command('archive_posts', days=365, stdout=StringIO())
+        self.assertIsNone(counters.get_cached_count(counters.SCOPE_ALL))
+
+    def test_deleting_author_cleans_archive(self):
+        """Удаление автора удаляет его посты и комментарии в архиве."""
+        call_command('archive_posts', days=365, stdout=StringIO())
+        User.objects.get(pk=self.user.pk).delete()
+        self.assertFalse(ArchivedPost.objects.exists())
+        self.assertFalse(ArchivedComment.objects.exists())
+
+    def test_deleting_group_detaches_archived_posts(self):
+        """Удаление группы обнуляет группу у архивных постов."""
+        group = Group.objects.create(
+            title=c.GROUP_TITLE,
+            slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+        Post.objects.filter(pk=self.old_post.pk).update(group=group)
+        call_command('archive_posts', days=365, stdout=StringIO())
+        group.delete()
+        self.assertIsNone(ArchivedPost.objects.get().group_id)
@@ -0,0 +1,41 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, RequestFactory
+
+from core.context_processors.cached import process_cached
+from core.context_processors.year import year
+
+
+class ContextProcessorTests(SimpleTestCase):
+    def test_process_cached_computes_once_per_interval(self):
+        """Значение пересчитывается только после истечения интервала."""
+        compute = mock.Mock(return_value={'value': 1})
+        processor = process_cached(interval=60)(compute)
+        request = RequestFactory().get('/')
+        with mock.patch('time.monotonic', return_value=100.0):
+            processor(request)
+            processor(request)
+        self.assertEqual(compute.call_count, 1)
+        with mock.patch('time.monotonic', return_value=161.0):
+            processor(request)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_year(self):
+        """Год берётся из кеша процесса."""
+        year.cache_clear()
+        self.assertIs(
+            year(RequestFactory().get('/')), year(RequestFactory().get('/'))
+        )
+
+
+class ProfileContextCommandTests(SimpleTestCase):
+    def test_reports_each_processor(self):
+        """Команда выводит время каждого контекст-процессора."""
+        out = StringIO()
+        call_command(
+            'profile_context', '/about/author/', iterations=1, stdout=out
+        )
+        self.assertIn('about:author', out.getvalue())
+        self.assertIn('core.context_processors.year.year', out.getvalue())
@@ -0,0 +1,130 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from . import constants as c
+from .. import counters
+from ..models import User, Group, Post, Comment
+from ..utils import EstimatedCountPaginator
+
+
+@override_settings(CACHES=c.SHARED_CACHES)
+class CountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=c.USERNAME)
+        cls.group = Group.objects.create(
+            title=c.GROUP_TITLE,
+            slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+        cls.another_group = Group.objects.create(
+            title=c.ANOTHER_GROUP_TITLE,
+            slug=c.ANOTHER_GROUP_SLUG,
+            description=c.ANOTHER_GROUP_DESCRIPTION,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def paginator(self, scope):
+        paginator = EstimatedCountPaginator(
+            Post.objects.filter(group=self.group), 10, scope=scope
+        )
+        paginator.exact_count_threshold = 1
+        return paginator
+
+    def test_cached_count_skips_count_query(self):
+        """Выше порога счётчик области берётся из кеша."""
+        Post.objects.create(author=self.user, text=c.POST_TEXT,
+                            group=self.group)
+        scope = counters.group_scope(self.group.pk)
+        self.assertEqual(self.paginator(scope).count, 1)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.paginator(scope).count, 1)
+        self.assertEqual(len(queries), 0)
+
+    def test_counts_follow_writes(self):
+        """Создание, перенос и удаление поста меняют счётчики областей."""
+        scope = counters.group_scope(self.group.pk)
+        another_scope = counters.group_scope(self.another_group.pk)
+        counters.set_cached_count(scope, 5)
+        counters.set_cached_count(another_scope, 5)
+        post = Post.objects.create(author=self.user, text=c.POST_TEXT,
+                                   group=self.group)
+        self.assertEqual(counters.get_cached_count(scope), 6)
+        post = Post.objects.get(pk=post.pk)
+        post.group = self.another_group
+        post.save()
+        self.assertEqual(counters.get_cached_count(scope), 5)
+        self.assertEqual(counters.get_cached_count(another_scope), 6)
+        post.delete()
+        self.assertEqual(counters.get_cached_count(another_scope), 5)
+
+    def test_generation_changes_on_write(self):
+        """Запись поста меняет поколение области."""
+        scope = counters.author_scope(self.user.pk)
+        generation = counters.get_generation(scope)
+        Post.objects.create(author=self.user, text=c.POST_TEXT)
+        self.assertNotEqual(counters.get_generation(scope), generation)
+
+    def test_cascade_delete_updates_counts(self):
+        """Каскадное удаление постов автора меняет счётчики."""
+        author = User.objects.create_user(username=c.VIEWER_USERNAME)
+        Post.objects.create(author=author, text=c.POST_TEXT, group=self.group)
+        scope = counters.group_scope(self.group.pk)
+        counters.set_cached_count(scope, 5)
+        generation = counters.get_generation(counters.SCOPE_ALL)
+        author.delete()
+        self.assertEqual(counters.get_cached_count(scope), 4)
+        self.assertNotEqual(
+            counters.get_generation(counters.SCOPE_ALL), generation
+        )
+
+    def test_group_delete_bumps_post_scopes(self):
+        """Удаление группы queryset'ом меняет поколения её постов."""
+        post = Post.objects.create(
+            author=self.user, text=c.POST_TEXT, group=self.another_group
+        )
+        scope = counters.post_scope(post.pk)
+        generation = counters.get_generation(scope)
+        Group.objects.filter(pk=self.another_group.pk).delete()
+        self.assertNotEqual(counters.get_generation(scope), generation)
+
+    def test_bulk_delete_does_not_select_comments(self):
+        """Комментарии удаляются одним DELETE, без выборки строк."""
+        post = Post.objects.create(author=self.user, text=c.POST_TEXT)
+        Comment.objects.bulk_create(
+            Comment(post=post, author=self.user, text=c.COMMENT_TEXT)
+            for _ in range(3)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            Post.objects.filter(pk=post.pk).delete()
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse([
+            query for query in queries
+            if query['sql'].startswith('SELECT')
+            and '"posts_comment"' in query['sql']
+        ])
+
+    def test_commenter_delete_bumps_post_scope(self):
+        """Каскадное удаление комментариев меняет поколение поста."""
+        post = Post.objects.create(author=self.user, text=c.POST_TEXT)
+        commenter = User.objects.create_user(username=c.VIEWER_USERNAME)
+        Comment.objects.create(
+            post=post, author=commenter, text=c.COMMENT_TEXT
+        )
+        scope = counters.post_scope(post.pk)
+        generation = counters.get_generation(scope)
+        commenter.delete()
+        self.assertNotEqual(counters.get_generation(scope), generation)
+
+
+class ProcessLocalCacheTests(TestCase):
+    def test_counts_are_not_cached(self):
+        """Без общего кеша числа постов не кешируются."""
+        scope = counters.group_scope(1)
+        counters.set_cached_count(scope, 5)
+        self.assertIsNone(counters.get_cached_count(scope))
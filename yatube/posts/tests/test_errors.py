@@ -0,0 +1,87 @@
+import time
+from http import HTTPStatus
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core import prerender
+from core.middleware import LoadSheddingMiddleware, queue_time
+from . import constants as c
+from ..models import User
+
+
+class ErrorPageTests(TestCase):
+    def setUp(self):
+        prerender.clear()
+        self.addCleanup(prerender.clear)
+
+    def test_not_found_skips_session_and_user(self):
+        """Страница 404 не читает сессию и пользователя."""
+        client = Client()
+        client.force_login(User.objects.create_user(username=c.USERNAME))
+        client.get('/missing-page/')
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/missing-page/')
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertEqual(len(queries), 0)
+        self.assertNotContains(
+            response, c.USERNAME, status_code=HTTPStatus.NOT_FOUND
+        )
+
+    def test_not_found_escapes_path(self):
+        """Адрес на странице 404 экранируется."""
+        response = Client().get('/<b>missing</b>/')
+        self.assertContains(
+            response, '&lt;b&gt;missing&lt;/b&gt;',
+            status_code=HTTPStatus.NOT_FOUND,
+        )
+
+    def test_csrf_failure_is_forbidden(self):
+        """Ошибка CSRF отдаётся со статусом 403."""
+        client = Client(enforce_csrf_checks=True)
+        response = client.post('/auth/login/')
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+
+@override_settings(
+    LOAD_SHEDDING_MAX_IN_FLIGHT=2, LOAD_SHEDDING_MAX_QUEUE_TIME=1.0
+)
+class LoadSheddingTests(TestCase):
+    def setUp(self):
+        self.middleware = LoadSheddingMiddleware(
+            lambda request: HttpResponse()
+        )
+        self.factory = RequestFactory()
+
+    def test_long_queue_time_is_shed(self):
+        """Запрос, долго ждавший в очереди прокси, получает 503."""
+        request = self.factory.get(
+            '/', HTTP_X_REQUEST_START=f't={(time.time() - 5) * 1000:.0f}'
+        )
+        response = self.middleware(request)
+        self.assertEqual(response.status_code, HTTPStatus.SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '5')
+
+    def test_in_flight_limit(self):
+        """Сверх лимита одновременных запросов отвечаем 503."""
+        self.middleware.in_flight = 2
+        response = self.middleware(self.factory.get('/'))
+        self.assertEqual(response.status_code, HTTPStatus.SERVICE_UNAVAILABLE)
+        self.middleware.in_flight = 1
+        response = self.middleware(self.factory.get('/'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(self.middleware.in_flight, 1)
+
+    def test_queue_time_units(self):
+        """Заголовок в секундах, миллисекундах и микросекундах."""
+        started = time.time() - 3
+        for value in (started, started * 1000, started * 1000000):
+            with self.subTest(value=value):
+                request = self.factory.get(
+                    '/', HTTP_X_REQUEST_START=f't={value:.0f}'
+                )
+                self.assertAlmostEqual(
+                    queue_time(request, 'HTTP_X_REQUEST_START'), 3, delta=1
+                )
@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from . import constants as c
+from ..models import User, Group, Post, Comment
+
+
+@override_settings(CACHES=c.SHARED_CACHES)
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=c.USERNAME)
+        cls.group = Group.objects.create(
+            title=c.GROUP_TITLE,
+            slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text=c.POST_TEXT, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def revalidate(self, client, url):
+        etag = client.get(url)['ETag']
+        return client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_pages_return_not_modified(self):
+        """Повторный запрос с тем же ETag получает 304."""
+        urls = (
+            reverse(c.URL_INDEX),
+            reverse(c.URL_GROUP, args=(self.group.slug,)),
+            reverse(c.URL_PROFILE, args=(self.user.username,)),
+            reverse(c.URL_POST_DETAIL, args=(self.post.pk,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.revalidate(self.guest_client, url)
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_MODIFIED
+                )
+
+    def test_new_comment_changes_post_detail_etag(self):
+        """Новый комментарий меняет ETag страницы поста."""
+        url = reverse(c.URL_POST_DETAIL, args=(self.post.pk,))
+        etag = self.guest_client.get(url)['ETag']
+        Comment.objects.create(
+            post=self.post, author=self.user, text=c.COMMENT_TEXT
+        )
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_new_post_changes_group_etag(self):
+        """Новый пост в группе меняет ETag ленты группы."""
+        url = reverse(c.URL_GROUP, args=(self.group.slug,))
+        etag = self.guest_client.get(url)['ETag']
+        Post.objects.create(
+            author=self.user, text=c.ANOTHER_POST_TEXT, group=self.group
+        )
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_etag_depends_on_user(self):
+        """ETag гостя не подходит авторизованному пользователю."""
+        url = reverse(c.URL_INDEX)
+        etag = self.guest_client.get(url)['ETag']
+        response = self.authorized_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_author_cascade_delete_changes_group_etag(self):
+        """Каскадное удаление постов автора меняет ETag группы."""
+        author = User.objects.create_user(username=c.VIEWER_USERNAME)
+        Post.objects.create(author=author, text=c.POST_TEXT, group=self.group)
+        url = reverse(c.URL_GROUP, args=(self.group.slug,))
+        etag = self.guest_client.get(url)['ETag']
+        author.delete()
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_group_edit_changes_post_etags(self):
+        """Правка группы меняет ETag страниц, где выводятся её посты."""
+        urls = (
+            reverse(c.URL_INDEX),
+            reverse(c.URL_PROFILE, args=(self.user.username,)),
+            reverse(c.URL_POST_DETAIL, args=(self.post.pk,)),
+        )
+        etags = {url: self.guest_client.get(url)['ETag'] for url in urls}
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = c.ANOTHER_GROUP_SLUG
+        group.save()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etags[url]
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+
+class ProcessLocalConditionalGetTests(TestCase):
+    def test_no_validators_without_shared_cache(self):
+        """Без общего кеша страницы отдаются без ETag."""
+        response = Client().get(reverse(c.URL_INDEX))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertFalse(response.has_header('ETag'))
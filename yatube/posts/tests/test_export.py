@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from http import HTTPStatus
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from . import constants as c
+from ..models import User, Group, Post, Comment
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=c.USERNAME)
+        cls.viewer = User.objects.create_user(username=c.VIEWER_USERNAME)
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'{c.POST_TEXT} {i}')
+            for i in range(5)
+        )
+        post = Post.objects.filter(author=cls.author).first()
+        Comment.objects.create(
+            post=post, author=cls.author, text=c.COMMENT_TEXT
+        )
+        Comment.objects.create(
+            post=post, author=cls.viewer, text=c.COMMENT_TEXT
+        )
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def export_url(self, export_format):
+        return reverse(
+            'posts:profile_export', args=(self.author.username,)
+        ) + f'?format={export_format}'
+
+    def test_ndjson_export(self):
+        """NDJSON: по строке на каждый пост и комментарий автора."""
+        response = self.author_client.get(self.export_url('ndjson'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        lines = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        types = [line['type'] for line in lines]
+        self.assertEqual(types, ['post'] * 5 + ['comment'])
+
+    def test_export_includes_archive(self):
+        """Архивные посты и комментарии автора попадают в выгрузку."""
+        post = Post.objects.filter(author=self.author).first()
+        group = Group.objects.create(
+            title=c.GROUP_TITLE,
+            slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+        Post.objects.filter(pk=post.pk).update(
+            pub_date=timezone.now() - timedelta(days=400), group=group
+        )
+        call_command('archive_posts', days=365, stdout=io.StringIO())
+        response = self.author_client.get(self.export_url('ndjson'))
+        lines = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        archived = [
+            (line['type'], line['id']) for line in lines if line['archived']
+        ]
+        self.assertEqual(len(lines), 6)
+        self.assertIn(('post', post.pk), archived)
+        self.assertEqual(
+            [line_type for line_type, _ in archived], ['post', 'comment']
+        )
+        archived_post = next(
+            line for line in lines
+            if line['archived'] and line['type'] == 'post'
+        )
+        self.assertEqual(archived_post['group'], c.GROUP_SLUG)
+
+    def test_zip_export(self):
+        """Архив читается zipfile и содержит посты и комментарии."""
+        response = self.author_client.get(self.export_url('zip'))
+        self.assertIn('attachment', response['Content-Disposition'])
+        archive = zipfile.ZipFile(
+            io.BytesIO(b''.join(response.streaming_content))
+        )
+        self.assertEqual(
+            archive.namelist(), ['posts.ndjson', 'comments.ndjson']
+        )
+        posts = archive.read('posts.ndjson').decode().splitlines()
+        self.assertEqual(len(posts), 5)
+
+    def test_export_of_another_user_is_hidden(self):
+        """Чужую выгрузку скачать нельзя."""
+        viewer_client = Client()
+        viewer_client.force_login(self.viewer)
+        response = viewer_client.get(self.export_url('zip'))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_command_writes_file(self):
+        """Команда export_profile пишет архив в файл."""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'export.zip')
+            call_command(
+                'export_profile', self.author.username,
+                output=output, stdout=io.StringIO(),
+            )
+            with zipfile.ZipFile(output) as archive:
+                comments = archive.read('comments.ndjson').splitlines()
+        self.assertEqual(len(comments), 1)
@@ -0,0 +1,173 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import constants as c
+from ..models import User, Group, Post, Follow
+
+
+@override_settings(CACHES=c.SHARED_CACHES)
+class SplitCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=c.USERNAME)
+        cls.viewer = User.objects.create_user(username=c.VIEWER_USERNAME)
+        cls.post = Post.objects.create(author=cls.author, text=c.POST_TEXT)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.viewer_client = Client()
+        self.viewer_client.force_login(self.viewer)
+
+    def test_cached_body_gets_user_fragments(self):
+        """Тело страницы общее, а шапка и форма - свои у каждого."""
+        url = reverse(c.URL_POST_DETAIL, args=(self.post.pk,))
+        self.author_client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.viewer_client.get(url)
+        self.assertNotIn('comments', response.context)
+        self.assertContains(response, f'Пользователь: {c.VIEWER_USERNAME}')
+        self.assertNotContains(response, f'Пользователь: {c.USERNAME}')
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        # Комментарии не выбираются: они уже в закешированном теле.
+        self.assertFalse(
+            [q for q in queries if '"posts_comment"."text"' in q['sql']]
+        )
+
+    def test_follow_button_is_personal(self):
+        """Кнопка подписки в закешированном профиле своя у каждого."""
+        url = reverse(c.URL_PROFILE, args=(self.author.username,))
+        Follow.objects.create(user=self.viewer, author=self.author)
+        self.guest_client.get(url)
+        self.assertContains(self.viewer_client.get(url), 'Отписаться')
+        self.assertContains(self.guest_client.get(url), 'Подписаться')
+
+    def test_new_post_changes_cache_key(self):
+        """Новый пост сразу виден на закешированной главной."""
+        url = reverse(c.URL_INDEX)
+        self.guest_client.get(url)
+        Post.objects.create(author=self.author, text=c.ANOTHER_POST_TEXT)
+        self.assertContains(self.guest_client.get(url), c.ANOTHER_POST_TEXT)
+
+    def test_group_edit_changes_cached_body(self):
+        """Закешированные страницы показывают группу после её правки."""
+        group = Group.objects.create(
+            title=c.GROUP_TITLE,
+            slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+        post = Post.objects.create(
+            author=self.author, text=c.ANOTHER_POST_TEXT, group=group
+        )
+        urls = (
+            reverse(c.URL_INDEX),
+            reverse(c.URL_PROFILE, args=(self.author.username,)),
+            reverse(c.URL_POST_DETAIL, args=(post.pk,)),
+        )
+        for url in urls:
+            self.guest_client.get(url)
+        group.title = c.ANOTHER_GROUP_TITLE
+        group.slug = c.ANOTHER_GROUP_SLUG
+        group.save()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(response, group.get_absolute_url())
+                self.assertNotContains(
+                    response, reverse(c.URL_GROUP, args=(c.GROUP_SLUG,))
+                )
+        self.assertContains(
+            self.guest_client.get(urls[-1]), c.ANOTHER_GROUP_TITLE
+        )
+
+    def test_cache_control(self):
+        """Анонимам - публичный кеш, авторизованным - приватный."""
+        url = reverse(c.URL_PROFILE, args=(self.author.username,))
+        self.assertIn(
+            'public', self.guest_client.get(url)['Cache-Control']
+        )
+        self.assertIn(
+            'private', self.viewer_client.get(url)['Cache-Control']
+        )
+
+    @override_settings(EDGE_SIDE_INCLUDES=True)
+    def test_edge_side_includes(self):
+        """В режиме ESI страница общая, а фрагменты отдаёт отдельный адрес."""
+        url = reverse(c.URL_POST_DETAIL, args=(self.post.pk,))
+        response = self.viewer_client.get(url)
+        self.assertContains(response, '<esi:include')
+        self.assertNotContains(response, c.VIEWER_USERNAME)
+        self.assertEqual(response['Surrogate-Control'], 'content="ESI/1.0"')
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+        fragment = self.viewer_client.get(
+            reverse('core:fragment', args=('header', ))
+        )
+        self.assertContains(fragment, f'Пользователь: {c.VIEWER_USERNAME}')
+
+    def test_unknown_fragment(self):
+        """Неизвестный фрагмент или неверные параметры - 404."""
+        cases = (
+            ('missing', {}),
+            ('comment_form', {}),
+            ('comment_form', {'post_id': 'x'}),
+            ('header', {'user': 'evil'}),
+            ('switcher', {'csrf_token': 'evil'}),
+            ('follow_button', {'username': '<b>'}),
+        )
+        for name, params in cases:
+            with self.subTest(name=name, params=params):
+                response = self.guest_client.get(
+                    reverse('core:fragment', args=(name, )), params
+                )
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_header_view_name_whitelist(self):
+        """Шапка принимает только имена страниц из своего меню."""
+        url = reverse('core:fragment', args=('header', ))
+        response = self.guest_client.get(url, {'view_name': 'users:login'})
+        self.assertEqual(response.context['view_name'], 'users:login')
+        response = self.guest_client.get(url, {'view_name': '"><script>'})
+        self.assertEqual(response.context['view_name'], '')
+
+
+class ProcessLocalPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=c.USERNAME)
+        Post.objects.create(author=cls.author, text=c.POST_TEXT)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_index_is_cached_for_guests(self):
+        """Без общего кеша главная для гостей кешируется в процессе."""
+        url = reverse(c.URL_INDEX)
+        Client().get(url)
+        with self.assertNumQueries(0):
+            response = Client().get(url)
+        self.assertContains(response, c.POST_TEXT)
+        self.assertIn('max-age=20', response['Cache-Control'])
+
+    def test_user_pages_are_not_cached(self):
+        """Авторизованным и без local_timeout страницы не кешируются."""
+        client = Client()
+        client.force_login(self.author)
+        client.get(reverse(c.URL_INDEX))
+        Post.objects.create(author=self.author, text=c.ANOTHER_POST_TEXT)
+        self.assertContains(
+            client.get(reverse(c.URL_INDEX)), c.ANOTHER_POST_TEXT
+        )
+        url = reverse(c.URL_PROFILE, args=(c.USERNAME, ))
+        Client().get(url)
+        with CaptureQueriesContext(connection) as queries:
+            Client().get(url)
+        self.assertTrue(queries)
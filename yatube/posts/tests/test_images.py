@@ -0,0 +1,148 @@
+import os
+import shutil
+import tempfile
+from hashlib import sha256
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from . import constants as c
+from .. import images
+from ..thumbnail import VARIANT_EXTENSIONS
+from ..models import Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ImageVariantsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post = Post.objects.create(
+            author=User.objects.create_user(username=c.USERNAME),
+            text=c.POST_TEXT,
+            image=SimpleUploadedFile(
+                name=c.GIF_NAME,
+                content=c.GIF_CONTENT,
+                content_type=c.GIF_CONTENT_TYPE,
+            ),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_build_variants_batch(self):
+        """Для каждой ширины и формата создаётся файл и метрики."""
+        totals = images.build_variants_batch([self.post.image.name], 1)
+        for image_format in images.variant_formats():
+            for width in images.VARIANT_WIDTHS:
+                with self.subTest(format=image_format, width=width):
+                    count, seconds, size = totals[image_format, width]
+                    self.assertEqual(count, 1)
+                    self.assertGreater(size, 0)
+                    thumbnail = images.variant(
+                        self.post.image, image_format, width
+                    )
+                    self.assertTrue(thumbnail.name.endswith(
+                        VARIANT_EXTENSIONS[image_format]
+                    ))
+                    self.assertTrue(os.path.isfile(
+                        os.path.join(TEMP_MEDIA_ROOT, thumbnail.name)
+                    ))
+        self.assertIn((images.ORIGINAL, images.CARD_WIDTH), totals)
+
+    def render_picture(self, post):
+        return Template('{% load images %}{% picture post %}').render(
+            Context({'post': post})
+        )
+
+    def test_picture_tag(self):
+        """Тег picture выводит srcset для всех форматов и запасной img."""
+        images.build_variants(self.post.image)
+        # Варианты лежат в базе, а не в кеше процесса фоновой задачи.
+        cache.clear()
+        html = self.render_picture(Post.objects.get(pk=self.post.pk))
+        for image_format in images.variant_formats():
+            self.assertIn(
+                f'<source type="{images.MIME_TYPES[image_format]}"', html
+            )
+        for width in images.VARIANT_WIDTHS:
+            self.assertIn(f' {width}w', html)
+        self.assertIn('<img', html)
+
+    def test_picture_tag_before_variants_are_built(self):
+        """Пока варианты не построены, выводится только запасной img."""
+        Post.objects.filter(pk=self.post.pk).update(image_sources='')
+        html = self.render_picture(Post.objects.get(pk=self.post.pk))
+        self.assertNotIn('<source', html)
+        self.assertIn('<img', html)
+
+    def test_new_image_resets_sources(self):
+        """Смена картинки сбрасывает варианты старой."""
+        images.build_variants(self.post.image)
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertTrue(post.image_sources)
+        post.image = SimpleUploadedFile(
+            name=f'new_{c.GIF_NAME}',
+            content=c.GIF_CONTENT,
+            content_type=c.GIF_CONTENT_TYPE,
+        )
+        post.save()
+        self.assertEqual(Post.objects.get(pk=post.pk).image_sources, '')
+
+    def test_picture_tag_without_image(self):
+        """Без картинки тег ничего не выводит."""
+        post = Post(author=self.post.author, text=c.POST_TEXT)
+        self.assertEqual(self.render_picture(post).strip(), '')
+
+    def test_metadata_saved_on_upload(self):
+        """Размеры и заглушка картинки сохраняются при загрузке."""
+        info = Post.objects.get(pk=self.post.pk).image_info
+        self.assertEqual((info.width, info.height), (2, 1))
+        self.assertEqual(info.format, 'GIF')
+        self.assertEqual(info.size, len(c.GIF_CONTENT))
+        self.assertEqual(info.hash, sha256(c.GIF_CONTENT).hexdigest())
+        self.assertTrue(info.placeholder.startswith('data:image/jpeg;base64,'))
+
+    def test_backfill_command(self):
+        """Команда заполняет метаданные у старых постов."""
+        Post.objects.filter(pk=self.post.pk).update(**images.EMPTY_METADATA)
+        call_command('backfill_image_metadata', workers=2, stdout=StringIO())
+        info = Post.objects.get(pk=self.post.pk).image_info
+        self.assertEqual((info.width, info.height), (2, 1))
+        self.assertEqual(info.hash, sha256(c.GIF_CONTENT).hexdigest())
+
+    def test_metadata_cleared_with_image(self):
+        """Без картинки метаданные очищаются."""
+        post = Post.objects.get(pk=self.post.pk)
+        post.image = None
+        post.save()
+        post.refresh_from_db()
+        self.assertIsNone(post.image_info)
+        self.assertIsNone(post.image_width)
+        self.assertEqual(post.image_hash, '')
+
+    def test_feed_images_are_lazy_except_first(self):
+        """В ленте грузится сразу только первая картинка."""
+        Post.objects.create(
+            author=self.post.author,
+            text=c.ANOTHER_POST_TEXT,
+            image=SimpleUploadedFile(
+                name=f'another_{c.GIF_NAME}',
+                content=c.GIF_CONTENT,
+                content_type=c.GIF_CONTENT_TYPE,
+            ),
+        )
+        response = self.client.get(reverse(c.URL_INDEX))
+        self.assertContains(response, 'loading="lazy"', count=1)
+        self.assertContains(response, 'width="960" height="339"', count=2)
+        self.assertContains(response, 'data:image/jpeg;base64,', count=2)
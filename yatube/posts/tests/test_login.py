@@ -0,0 +1,96 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from . import constants as c
+from ..models import User
+
+PASSWORD = 'correct-horse-battery'
+
+
+@override_settings(
+    CACHES=c.SHARED_CACHES,
+    LOGIN_RATE_LIMITS={'ip': (5, 60), 'username': (2, 60)},
+)
+class LoginTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username=c.USERNAME, password=PASSWORD
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def login(self, password, username=c.USERNAME):
+        return self.client.post(
+            reverse('users:login'),
+            {'username': username, 'password': password},
+        )
+
+    def test_login_succeeds(self):
+        """Вход с верным паролем."""
+        response = self.login(PASSWORD)
+        self.assertRedirects(response, reverse('posts:index'))
+
+    def test_username_limit_rejects_before_hashing(self):
+        """После лимита неудач хеш пароля больше не вычисляется."""
+        self.login('wrong')
+        self.login('wrong')
+        with mock.patch('users.backends.check_password') as check:
+            response = self.login(PASSWORD)
+        check.assert_not_called()
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+
+    def test_ip_limit_covers_all_usernames(self):
+        """Лимит по IP действует на попытки с разными логинами."""
+        for i in range(5):
+            self.login('wrong', username=f'user{i}')
+        response = self.login(PASSWORD)
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+
+    def test_legacy_hash_is_upgraded(self):
+        """Хеш устаревшим алгоритмом пересчитывается при входе."""
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password(PASSWORD, hasher='pbkdf2_sha1')
+        )
+        self.login(PASSWORD)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.password.startswith('pbkdf2_sha1$'))
+
+    def test_failed_login_hashes_once(self):
+        """Неудачный вход не проверяется вторым бэкендом."""
+        with mock.patch(
+            'django.contrib.auth.backends.ModelBackend.authenticate'
+        ) as fallback:
+            self.login('wrong')
+        fallback.assert_not_called()
+
+    def test_sessions_of_previous_backend_stay_valid(self):
+        """Сессии, выданные через ModelBackend, не сбрасываются."""
+        self.client.force_login(
+            User.objects.get(pk=self.user.pk),
+            backend='django.contrib.auth.backends.ModelBackend',
+        )
+        response = self.client.get(reverse('about:author'))
+        self.assertContains(response, c.USERNAME)
+
+
+@override_settings(LOGIN_RATE_LIMITS={'ip': (1, 60), 'username': (1, 60)})
+class ProcessLocalLoginTests(TestCase):
+    def test_no_limits_without_shared_cache(self):
+        """В кеше процесса попытки входа не считаются."""
+        User.objects.create_user(username=c.USERNAME, password=PASSWORD)
+        client = Client()
+        for _ in range(3):
+            response = client.post(
+                reverse('users:login'),
+                {'username': c.USERNAME, 'password': 'wrong'},
+            )
+            self.assertEqual(response.status_code, HTTPStatus.OK)
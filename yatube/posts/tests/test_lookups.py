@@ -0,0 +1,136 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (
+    TestCase, TransactionTestCase, Client, RequestFactory, override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.middleware import RateLimitMiddleware
+from . import constants as c
+from .. import lookups
+from ..models import User, Group, Post
+
+MISSING_USERNAME = 'no-such-user'
+
+
+@override_settings(CACHES=c.SHARED_CACHES)
+class NegativeLookupTests(TransactionTestCase):
+    # Метки ставятся в transaction.on_commit.
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def profile(self, username=MISSING_USERNAME):
+        return self.client.get(
+            reverse('posts:profile', kwargs={'username': username})
+        )
+
+    def test_repeated_missing_profile_skips_database(self):
+        """Повторный 404 для несуществующего логина не трогает базу."""
+        self.assertEqual(self.profile().status_code, HTTPStatus.NOT_FOUND)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.profile()
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertEqual(len(queries), 0)
+
+    def test_created_user_is_found(self):
+        """Созданный пользователь сразу доступен, хотя его искали."""
+        self.profile()
+        User.objects.create_user(username=MISSING_USERNAME)
+        self.assertEqual(self.profile().status_code, HTTPStatus.OK)
+
+    def test_deleted_group_is_missing(self):
+        """Удалённая группа сразу помечается отсутствующей."""
+        group = Group.objects.create(
+            title=c.GROUP_TITLE,
+            slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+        self.assertFalse(lookups.is_missing(lookups.SLUG, group.slug))
+        group.delete()
+        self.assertTrue(lookups.is_missing(lookups.SLUG, group.slug))
+
+    def test_deleted_post_is_not_marked_missing(self):
+        """Удаление поста не помечает id: пост может быть в архиве."""
+        author = User.objects.create_user(username=c.USERNAME)
+        post = Post.objects.create(author=author, text=c.POST_TEXT)
+        post_id = post.pk
+        post.delete()
+        self.assertFalse(lookups.is_missing(lookups.POST, post_id))
+
+    def test_late_miss_keeps_present_mark(self):
+        """Промах, начатый до создания объекта, не скрывает его."""
+        empty = User.objects.filter(username=MISSING_USERNAME)
+        User.objects.create_user(username=MISSING_USERNAME)
+        # Запрос прочитал базу до создания и пишет результат после.
+        with mock.patch.object(empty, 'first', return_value=None):
+            lookups.first(lookups.USERNAME, MISSING_USERNAME, empty)
+        self.assertFalse(
+            lookups.is_missing(lookups.USERNAME, MISSING_USERNAME)
+        )
+        self.assertEqual(self.profile().status_code, HTTPStatus.OK)
+
+    def test_edit_requires_integer_id(self):
+        """Адрес редактирования принимает только числовой id."""
+        self.client.force_login(User.objects.create_user(c.USERNAME))
+        response = self.client.get('/posts/abc/edit/')
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class ProcessLocalLookupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_miss_is_not_remembered(self):
+        """В кеше процесса отсутствие объекта не запоминается."""
+        lookups.first(
+            lookups.USERNAME, MISSING_USERNAME,
+            User.objects.filter(username=MISSING_USERNAME),
+        )
+        self.assertFalse(
+            lookups.is_missing(lookups.USERNAME, MISSING_USERNAME)
+        )
+
+    @override_settings(RATELIMIT_RATE=1, RATELIMIT_BURST=1)
+    def test_requests_are_not_limited(self):
+        """В кеше процесса частота запросов не ограничивается."""
+        middleware = RateLimitMiddleware(lambda request: HttpResponse())
+        for _ in range(3):
+            response = middleware(RequestFactory().get('/'))
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+
+
+@override_settings(
+    CACHES=c.SHARED_CACHES, RATELIMIT_RATE=1, RATELIMIT_BURST=2
+)
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.middleware = RateLimitMiddleware(
+            lambda request: HttpResponse()
+        )
+        self.factory = RequestFactory()
+
+    def test_burst_then_too_many_requests(self):
+        """Сверх корзины токенов IP получает 429 с Retry-After."""
+        for _ in range(2):
+            response = self.middleware(self.factory.get('/'))
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+        response = self.middleware(self.factory.get('/'))
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '1')
+        other_ip = self.factory.get('/', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(
+            self.middleware(other_ip).status_code, HTTPStatus.OK
+        )
+
+    def test_static_is_not_limited(self):
+        """Запросы к статике не расходуют токены."""
+        for _ in range(5):
+            response = self.middleware(self.factory.get('/static/app.css'))
+            self.assertEqual(response.status_code, HTTPStatus.OK)
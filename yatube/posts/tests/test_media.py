@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+from http import HTTPStatus
+
+from django.conf import settings
+from django.test import Client, SimpleTestCase, override_settings
+
+from core import media
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CONTENT = bytes(range(256)) * 4
+URL = '/media/posts/image.gif'
+PRIVATE_URL = '/media/private/image.gif'
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class MediaServingTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        for folder in ('posts', 'private'):
+            os.makedirs(os.path.join(TEMP_MEDIA_ROOT, folder))
+            with open(
+                os.path.join(TEMP_MEDIA_ROOT, folder, 'image.gif'), 'wb'
+            ) as file:
+                file.write(CONTENT)
+        media.register_access_check(
+            'private/', lambda request, path: request.user.is_staff
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        media._access_checks.clear()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_full_file(self):
+        """Файл отдаётся целиком с валидаторами и кешем."""
+        response = self.client.get(URL)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/gif')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_byte_ranges(self):
+        """Диапазоны байт отдаются с кодом 206."""
+        ranges = {
+            'bytes=0-9': (0, 9),
+            'bytes=1000-': (1000, len(CONTENT) - 1),
+            'bytes=-24': (len(CONTENT) - 24, len(CONTENT) - 1),
+            'bytes=10-5000': (10, len(CONTENT) - 1),
+        }
+        for header, (start, end) in ranges.items():
+            with self.subTest(range=header):
+                response = self.client.get(URL, HTTP_RANGE=header)
+                self.assertEqual(
+                    response.status_code, HTTPStatus.PARTIAL_CONTENT
+                )
+                self.assertEqual(
+                    b''.join(response.streaming_content),
+                    CONTENT[start:end + 1],
+                )
+                self.assertEqual(
+                    response['Content-Range'],
+                    f'bytes {start}-{end}/{len(CONTENT)}',
+                )
+                self.assertEqual(
+                    int(response['Content-Length']), end - start + 1
+                )
+
+    def test_unsatisfiable_range(self):
+        """Диапазон за концом файла - 416."""
+        response = self.client.get(URL, HTTP_RANGE='bytes=5000-')
+        self.assertEqual(
+            response.status_code, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+
+    def test_stale_if_range_gets_full_file(self):
+        """Устаревший If-Range отменяет диапазон."""
+        response = self.client.get(
+            URL, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_not_modified(self):
+        """Повторный запрос с ETag получает 304."""
+        etag = self.client.get(URL)['ETag']
+        response = self.client.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_path_outside_media_root(self):
+        """Выход за MEDIA_ROOT и отсутствующий файл - 404."""
+        for url in ('/media/../manage.py', '/media/posts/missing.gif'):
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.client.get(url).status_code, HTTPStatus.NOT_FOUND
+                )
+
+    def test_access_check(self):
+        """Закрытый файл не виден без доступа и не кешируется публично."""
+        self.assertEqual(
+            self.client.get(PRIVATE_URL).status_code, HTTPStatus.NOT_FOUND
+        )
+
+    @override_settings(MEDIA_SENDFILE='x-accel')
+    def test_x_accel_redirect(self):
+        """Отдачу файла можно передать nginx."""
+        response = self.client.get(URL)
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-media/posts/image.gif'
+        )
+        self.assertEqual(response.content, b'')
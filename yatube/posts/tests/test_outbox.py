@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+from http import HTTPStatus
+from unittest import mock
+
+from django.core.mail import send_mail
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.mail import deliver_pending
+from core.models import OutgoingEmail
+from . import constants as c
+from ..models import User
+
+TEMP_EMAIL_DIR = tempfile.mkdtemp()
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxBackend',
+    EMAIL_OUTBOX_BACKEND='django.core.mail.backends.filebased.EmailBackend',
+    EMAIL_FILE_PATH=TEMP_EMAIL_DIR,
+    EMAIL_OUTBOX_BATCH_SIZE=2,
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+)
+class OutboxTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_EMAIL_DIR, ignore_errors=True)
+
+    def sent_files(self):
+        return os.listdir(TEMP_EMAIL_DIR)
+
+    def test_password_reset_only_enqueues(self):
+        """Сброс пароля ставит письмо в очередь и ничего не отправляет."""
+        User.objects.create_user(
+            username=c.USERNAME, email='user@example.com',
+            password='password',
+        )
+        files_before = self.sent_files()
+        response = Client().post(
+            reverse('users:password_reset_form'),
+            {'email': 'user@example.com'},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, OutgoingEmail.PENDING)
+        self.assertEqual(self.sent_files(), files_before)
+
+    def test_worker_delivers_in_batches(self):
+        """Обработчик отправляет всю очередь пачками через file backend."""
+        for i in range(5):
+            send_mail(f'Тема {i}', 'Текст', None, ['user@example.com'])
+        self.assertEqual(deliver_pending(), (5, 0))
+        self.assertFalse(
+            OutgoingEmail.objects.exclude(status=OutgoingEmail.SENT).exists()
+        )
+        self.assertTrue(self.sent_files())
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        """Ошибка отправки откладывает письмо, потом помечает ошибочным."""
+        send_mail('Тема', 'Текст', None, ['user@example.com'])
+        with mock.patch(
+            'django.core.mail.backends.filebased.EmailBackend.send_messages',
+            side_effect=OSError('disk full'),
+        ):
+            self.assertEqual(deliver_pending(), (0, 1))
+            email = OutgoingEmail.objects.get()
+            self.assertEqual(email.attempts, 1)
+            self.assertGreater(email.next_attempt, email.created)
+            OutgoingEmail.objects.update(next_attempt=email.created)
+            deliver_pending()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.FAILED)
+        self.assertIn('disk full', email.error)
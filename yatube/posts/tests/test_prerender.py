@@ -0,0 +1,91 @@
+import gzip
+import os
+import shutil
+import tempfile
+from http import HTTPStatus
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core import prerender
+from . import constants as c
+from ..models import User
+
+TEMP_PRERENDER_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(PRERENDER_ROOT=TEMP_PRERENDER_ROOT)
+class PrerenderTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_PRERENDER_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        prerender.clear()
+        self.addCleanup(prerender.clear)
+        self.guest_client = Client()
+
+    def test_anonymous_page_is_shared_and_conditional(self):
+        """Анонимам отдаётся общая копия с ETag и ответом 304."""
+        url = reverse('about:author')
+        response = self.guest_client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn('public', response['Cache-Control'])
+        response = self.guest_client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_gzip(self):
+        """Сжатая версия отдаётся клиентам с поддержкой gzip."""
+        response = self.guest_client.get(
+            reverse('about:tech'), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Технологии', gzip.decompress(response.content).decode())
+
+    def test_gzip_has_own_etag(self):
+        """У сжатой версии свой ETag, и он не подходит несжатой."""
+        url = reverse('about:tech')
+        plain = self.guest_client.get(url)
+        compressed = self.guest_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotEqual(plain['ETag'], compressed['ETag'])
+        response = self.guest_client.get(
+            url, HTTP_IF_NONE_MATCH=compressed['ETag']
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotIn('Content-Encoding', response)
+        response = self.guest_client.get(
+            url, HTTP_IF_NONE_MATCH=compressed['ETag'],
+            HTTP_ACCEPT_ENCODING='gzip',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_header_is_filled_for_user(self):
+        """Шапка заполняется для авторизованного пользователя."""
+        client = Client()
+        client.force_login(User.objects.create_user(username=c.USERNAME))
+        response = client.get(reverse('about:author'))
+        self.assertContains(response, c.USERNAME)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_not_found_shows_path(self):
+        """На странице 404 выводится запрошенный адрес."""
+        response = self.guest_client.get('/missing-page/')
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertContains(
+            response, '/missing-page/', status_code=HTTPStatus.NOT_FOUND
+        )
+
+    def test_command_builds_pages(self):
+        """Команда пишет страницы на диск, и они отдаются из файла."""
+        call_command('prerender_pages', stdout=StringIO())
+        filename = prerender.page_file('about/author')
+        self.assertTrue(os.path.isfile(filename))
+        with open(filename, 'a', encoding='utf-8') as file:
+            file.write('<!-- prerendered -->')
+        response = self.guest_client.get(reverse('about:author'))
+        self.assertContains(response, '<!-- prerendered -->')
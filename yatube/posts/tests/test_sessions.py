@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.auth import snapshot_key
+from . import constants as c
+from ..models import User
+
+
+@override_settings(
+    CACHES=c.SHARED_CACHES,
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+)
+class CachedSessionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username=c.USERNAME, password='password'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_warm_request_skips_session_and_user_queries(self):
+        """Повторный запрос не читает django_session и auth_user."""
+        self.client.get(reverse('about:author'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('about:author'))
+        self.assertContains(response, c.USERNAME)
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('django_session', tables)
+        self.assertNotIn('auth_user', tables)
+
+    def test_password_change_ends_other_sessions(self):
+        """После смены пароля снимок со старым хешем не принимается."""
+        self.client.get(reverse('about:author'))
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('new-password')
+        user.save()
+        response = self.client.get(reverse('posts:post_create'))
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_logout_drops_snapshot(self):
+        """Выход из аккаунта удаляет снимок из кеша."""
+        self.client.get(reverse('about:author'))
+        self.assertIsNotNone(cache.get(snapshot_key(self.user.pk)))
+        self.client.logout()
+        self.assertIsNone(cache.get(snapshot_key(self.user.pk)))
+
+
+class ProcessLocalSessionTests(TestCase):
+    def test_user_read_from_database_without_shared_cache(self):
+        """Без общего кеша снимок не используется."""
+        user = User.objects.create_user(username=c.USERNAME)
+        client = Client()
+        client.force_login(user)
+        client.get(reverse('about:author'))
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('about:author'))
+        self.assertContains(response, c.USERNAME)
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertIn('auth_user', tables)
+        self.assertIsNone(cache.get(snapshot_key(user.pk)))
@@ -0,0 +1,72 @@
+from django.contrib.auth import password_validation
+from django.core import mail
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from core.models import Job
+from users.forms import CreationForm
+from users.validators import CommonPasswordValidator
+from . import constants as c
+from ..models import User, Follow
+
+PASSWORD = 'signup-Password-42'
+
+
+class SignUpTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=c.USERNAME)
+
+    def signup(self, username='newcomer'):
+        return Client().post(reverse('users:signup'), {
+            'username': username,
+            'email': 'newcomer@example.com',
+            'password1': PASSWORD,
+            'password2': PASSWORD,
+        })
+
+    @override_settings(
+        JOBS_ALWAYS_EAGER=True, SIGNUP_DEFAULT_FOLLOWS=[c.USERNAME]
+    )
+    def test_signup_runs_background_jobs(self):
+        """Письмо и подписки по умолчанию выполняются фоновыми задачами."""
+        self.signup()
+        user = User.objects.get(username='newcomer')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertTrue(
+            Follow.objects.filter(user=user, author=self.author).exists()
+        )
+        self.assertEqual(
+            Job.objects.filter(status=Job.DONE).count(), 2
+        )
+
+    def test_signup_does_not_wait_for_jobs(self):
+        """Без eager-режима регистрация только ставит задачи в очередь."""
+        self.signup()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Job.objects.get().status, Job.PENDING)
+
+    def test_username_is_unique(self):
+        """Занятый логин отклоняется одним индексированным запросом."""
+        form = CreationForm({
+            'username': c.USERNAME,
+            'password1': PASSWORD,
+            'password2': PASSWORD,
+        })
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['username'][0], (
+            User._meta.get_field('username').error_messages['unique']
+        ))
+
+    def test_common_passwords_are_shared(self):
+        """Список частых паролей загружен один раз во frozenset."""
+        validator = next(
+            validator
+            for validator in
+            password_validation.get_default_password_validators()
+            if isinstance(validator, CommonPasswordValidator)
+        )
+        self.assertIsInstance(validator.passwords, frozenset)
+        self.assertIs(CommonPasswordValidator().passwords, validator.passwords)
@@ -0,0 +1,33 @@
+from django.test import SimpleTestCase, override_settings
+
+from core import startup
+from core.management.commands.profile_startup import parse_importtime
+
+
+class StartupTests(SimpleTestCase):
+    databases = '__all__'
+
+    @override_settings(WARM_UP_DATABASE=True)
+    def test_warm_up_runs_all_phases(self):
+        """Прогрев компилирует шаблоны проекта и заполняет резолвер."""
+        timings = {name: count for name, _, count in startup.warm_up()}
+        self.assertEqual(
+            list(timings), ['urls', 'templates', 'pages', 'database']
+        )
+        self.assertGreater(timings['templates'], 0)
+        self.assertGreater(timings['urls'], 0)
+
+    def test_warm_up_skips_database_by_default(self):
+        """Без WARM_UP_DATABASE соединения с базой не открываются."""
+        timings = [name for name, _, _ in startup.warm_up()]
+        self.assertNotIn('database', timings)
+
+    def test_parse_importtime(self):
+        """Строки -X importtime разбираются в (модуль, своё, всего)."""
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        150 |   django.urls\n'
+        )
+        self.assertEqual(
+            parse_importtime(output), [('django.urls', 120, 150)]
+        )
@@ -0,0 +1,97 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.static import StaticFilesApplication
+
+TEMP_STATIC_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CSS = 'css/bootstrap.min.css'
+
+
+def django_application(environ, start_response):
+    start_response('200 OK', [])
+    return [b'django']
+
+
+@override_settings(
+    STATIC_ROOT=TEMP_STATIC_ROOT,
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage',
+)
+class StaticPipelineTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(os.path.join(TEMP_STATIC_ROOT, 'staticfiles.json')) as f:
+            cls.hashed_css = json.load(f)['paths'][CSS]
+        cls.application = StaticFilesApplication(django_application)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+
+    def request(self, path, **environ):
+        response = {}
+
+        def start_response(status, headers):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, **environ}
+        body = b''.join(self.application(environ, start_response))
+        return response['status'], response['headers'], body
+
+    def test_collectstatic_builds_compressed_variants(self):
+        """collectstatic создаёт файлы с хешем и их сжатые копии."""
+        self.assertNotEqual(self.hashed_css, CSS)
+        self.assertTrue(
+            os.path.isfile(os.path.join(TEMP_STATIC_ROOT, self.hashed_css))
+        )
+        self.assertTrue(os.path.isfile(
+            os.path.join(TEMP_STATIC_ROOT, f'{self.hashed_css}.gz')
+        ))
+
+    def test_hashed_file_is_immutable(self):
+        """Файл с хешем кешируется на год и отдаётся сжатым."""
+        status, headers, body = self.request(
+            f'/static/{self.hashed_css}', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', headers['Cache-Control'])
+        self.assertEqual(int(headers['Content-Length']), len(body))
+
+    def test_unhashed_file_has_short_max_age(self):
+        """Файл без хеша кешируется ненадолго и без сжатия по запросу."""
+        status, headers, _ = self.request(f'/static/{CSS}')
+        self.assertEqual(status, '200 OK')
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertNotIn('immutable', headers['Cache-Control'])
+
+    def test_not_modified(self):
+        """Повторный запрос с ETag получает 304."""
+        path = f'/static/{self.hashed_css}'
+        _, headers, _ = self.request(path)
+        status, _, body = self.request(
+            path, HTTP_IF_NONE_MATCH=headers['ETag']
+        )
+        self.assertEqual(status, '304 Not Modified')
+        self.assertEqual(body, b'')
+
+    def test_outside_static_root(self):
+        """Пути вне STATIC_ROOT и несуществующие файлы - 404."""
+        for path in ('/static/../manage.py', '/static/missing.css'):
+            with self.subTest(path=path):
+                status, _, _ = self.request(path)
+                self.assertEqual(status, '404 Not Found')
+
+    def test_other_paths_go_to_django(self):
+        """Запросы вне STATIC_URL обрабатывает Django."""
+        _, _, body = self.request('/')
+        self.assertEqual(body, b'django')
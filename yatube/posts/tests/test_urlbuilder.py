@@ -0,0 +1,55 @@
+from django.test import TestCase
+from django.urls import reverse, set_script_prefix, clear_script_prefix
+
+from core.urlbuilder import build
+from . import constants as c
+from ..models import User, Group, Post
+
+
+class UrlBuilderTests(TestCase):
+    def test_build_matches_reverse(self):
+        """build() совпадает с reverse() для всех маршрутов posts."""
+        routes = (
+            ('posts:index', ()),
+            ('posts:follow_index', ()),
+            ('posts:group_list', (c.GROUP_SLUG, )),
+            ('posts:profile', ('имя пользователя', )),
+            ('posts:profile_follow', ('user@name+1', )),
+            ('posts:post_detail', (1, )),
+            ('posts:add_comment', (42, )),
+        )
+        for viewname, args in routes:
+            with self.subTest(viewname=viewname, args=args):
+                self.assertEqual(
+                    build(viewname, *args), reverse(viewname, args=args)
+                )
+
+    def test_script_prefix(self):
+        """Префикс скрипта учитывается отдельно для каждого значения."""
+        set_script_prefix('/yatube/')
+        try:
+            self.assertEqual(build('posts:index'), reverse('posts:index'))
+        finally:
+            clear_script_prefix()
+        self.assertEqual(build('posts:index'), '/')
+
+    def test_get_absolute_url(self):
+        """Post, Group и User знают свои адреса."""
+        author = User.objects.create_user(username=c.USERNAME)
+        group = Group.objects.create(
+            title=c.GROUP_TITLE, slug=c.GROUP_SLUG,
+            description=c.GROUP_DESCRIPTION,
+        )
+        post = Post.objects.create(author=author, group=group, text='-')
+        self.assertEqual(
+            author.get_absolute_url(),
+            reverse('posts:profile', args=(author.username, )),
+        )
+        self.assertEqual(
+            group.get_absolute_url(),
+            reverse('posts:group_list', args=(group.slug, )),
+        )
+        self.assertEqual(
+            post.get_absolute_url(),
+            reverse('posts:post_detail', args=(post.pk, )),
+        )
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+from django.core.paginator import Paginator
+from django.test import SimpleTestCase
+
+from ..utils import get_page_window
+
+
+class PageWindowTests(SimpleTestCase):
+    def test_window_in_the_middle(self):
+        """Окно вокруг текущей страницы с первой и последней."""
+        page_obj = Paginator(range(1000), 10).page(50)
+        self.assertEqual(
+            get_page_window(page_obj), [1, None, 48, 49, 50, 51, 52, None, 100]
+        )
+
+    def test_window_near_edges(self):
+        """Рядом с краями пропуски не выводятся."""
+        paginator = Paginator(range(60), 10)
+        self.assertEqual(
+            get_page_window(paginator.page(1)), [1, 2, 3, None, 6]
+        )
+        self.assertEqual(
+            get_page_window(paginator.page(4)), [1, 2, 3, 4, 5, 6]
+        )
+
+    def test_window_size_does_not_depend_on_page_count(self):
+        """Размер окна не растёт вместе с числом страниц."""
+        page_obj = Paginator(range(10 ** 6), 10).page(5000)
+        self.assertEqual(len(get_page_window(page_obj)), 9)
+
+    def test_window_without_page_count(self):
+        """Без известного числа страниц окно доходит до следующей."""
+        page_obj = SimpleNamespace(
+            number=7,
+            has_next=lambda: True,
+            paginator=SimpleNamespace(num_pages=None),
+        )
+        self.assertEqual(get_page_window(page_obj), [1, None, 5, 6, 7, 8])
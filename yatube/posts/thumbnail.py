@@ -0,0 +1,33 @@
+"""Бэкенд и движок sorl-thumbnail для вариантов картинок (posts.images).
+
+Вынесены отдельно, чтобы posts.images, который импортируется моделями,
+не загружал Pillow и sorl при старте процесса: sorl импортирует этот
+модуль по THUMBNAIL_BACKEND и THUMBNAIL_ENGINE, только когда строит
+первую миниатюру.
+"""
+from PIL import Image
+from sorl.thumbnail.base import (
+    EXTENSIONS, ThumbnailBackend as BaseThumbnailBackend,
+)
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.engines.pil_engine import Engine as BaseEngine
+from sorl.thumbnail.helpers import serialize, tokey
+
+VARIANT_EXTENSIONS = {**EXTENSIONS, 'AVIF': 'avif'}
+
+
+class ThumbnailBackend(BaseThumbnailBackend):
+    """Бэкенд sorl-thumbnail, который умеет сохранять AVIF."""
+
+    def _get_thumbnail_filename(self, source, geometry_string, options):
+        key = tokey(source.key, geometry_string, serialize(options))
+        path = f'{key[:2]}/{key[2:4]}/{key}'
+        extension = VARIANT_EXTENSIONS[options['format']]
+        return f'{thumbnail_settings.THUMBNAIL_PREFIX}{path}.{extension}'
+
+
+class Engine(BaseEngine):
+    """PIL-движок sorl-thumbnail для Pillow 10+, где нет Image.ANTIALIAS."""
+
+    def _scale(self, image, width, height):
+        return image.resize((width, height), resample=Image.LANCZOS)
@@ -10,7 +10,7 @@ urlpatterns = [
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
-    path('posts/<post_id>/edit/', views.post_edit, name='edit'),
+    path('posts/<int:post_id>/edit/', views.post_edit, name='edit'),
     path('posts/<int:post_id>/comment/', views.add_comment, name='add_comment'),
     path('follow/', views.follow_index, name='follow_index'),
     path(
@@ -23,4 +23,9 @@ urlpatterns = [
         views.profile_unfollow,
         name='profile_unfollow'
     ),
+    path(
+        'profile/<str:username>/export/',
+        views.profile_export,
+        name='profile_export'
+    ),
 ]
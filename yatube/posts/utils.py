@@ -1,10 +1,108 @@
 from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from . import counters
 
 NUMBER_OF_POSTS = 10
+EXACT_COUNT_THRESHOLD = 10000
+PAGES_ON_EACH_SIDE = 2
 
 
-def get_page_obj(request, post_list):
-    paginator = Paginator(post_list, NUMBER_OF_POSTS)
+def get_page_obj(request, post_list, scope=None):
+    paginator = EstimatedCountPaginator(
+        post_list, NUMBER_OF_POSTS, scope=scope
+    )
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
     return page_obj
+
+
+def get_page_window(page_obj, on_each_side=PAGES_ON_EACH_SIDE):
+    """Номера страниц вокруг текущей плюс первая и последняя.
+
+    None в списке означает пропуск (многоточие). Если пагинатор не знает
+    числа страниц (num_pages is None), последняя страница не выводится,
+    а окно справа ограничено следующей страницей.
+    """
+    number = page_obj.number
+    last = page_obj.paginator.num_pages
+    start = max(1, number - on_each_side)
+    if last is None:
+        end = number + 1 if page_obj.has_next() else number
+    else:
+        end = min(last, number + on_each_side)
+    window = []
+    if start > 1:
+        window.append(1)
+        if start > 2:
+            window.append(None)
+    window.extend(range(start, end + 1))
+    if last is not None and end < last:
+        if end < last - 1:
+            window.append(None)
+        window.append(last)
+    return window
+
+
+def estimate_count(queryset):
+    """Оценка числа строк без полного COUNT(*).
+
+    Возвращает None, если оценить нельзя: запрос с фильтрами
+    или СУБД без статистики планировщика. Максимум первичного ключа
+    оценкой не годится: после удалений и архивации он завышает число
+    строк, и пагинатор показывает пустые страницы в конце.
+    """
+    query = queryset.query
+    if query.where.children or query.distinct or not query.can_filter():
+        return None
+    model = queryset.model
+    connection = connections[queryset.db]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [table],
+            )
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT table_rows FROM information_schema.tables '
+                'WHERE table_schema = DATABASE() AND table_name = %s',
+                [table],
+            )
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] is not None else None
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор, не считающий COUNT(*) на больших выборках.
+
+    Выше порога число объектов берётся из кеша области scope
+    (см. posts.counters) или из оценки планировщика; ниже порога
+    и там, где оценки нет (SQLite), выполняется точный подсчёт.
+    """
+    exact_count_threshold = EXACT_COUNT_THRESHOLD
+
+    def __init__(self, *args, scope=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scope = scope
+
+    @cached_property
+    def count(self):
+        threshold = self.exact_count_threshold
+        if self.scope is not None:
+            cached = counters.get_cached_count(self.scope)
+            if cached is not None and cached >= threshold:
+                return cached
+        count = None
+        if hasattr(self.object_list, 'query'):
+            count = estimate_count(self.object_list)
+        if count is None or count < threshold:
+            count = super().count
+        if self.scope is not None and count >= threshold:
+            counters.set_cached_count(self.scope, count)
+        return count
@@ -1,49 +1,64 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.cache import cache_page
+from django.http import Http404, StreamingHttpResponse
 
-from .models import Post, Group, User, Follow
+from core.decorators import conditional_page, split_cache_page
+from core.jobs import enqueue
+from . import counters, etags, export, lookups
+from .models import Post, Group, User, Follow, ArchivedPost
 from .forms import PostForm, CommentForm
 from .utils import get_page_obj
 
 
-@cache_page(20)
+@conditional_page(etags.index_validators, shared=True)
+@split_cache_page(etags.index_page_key, timeout=20, local_timeout=20)
 def index(request):
     post_list = Post.objects.all()
     context = {
-        'page_obj': get_page_obj(request, post_list),
+        'page_obj': get_page_obj(request, post_list, counters.SCOPE_ALL),
     }
     return render(request, 'posts/index.html', context)
 
 
+@lookups.reject_missing(lookups.SLUG, 'slug')
+@conditional_page(etags.group_validators, shared=True)
+@split_cache_page(etags.group_page_key)
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
+    group = lookups.get_or_404(
+        lookups.SLUG, slug, Group.objects.filter(slug=slug)
+    )
     post_list = group.posts.all()
     context = {
         'group': group,
-        'page_obj': get_page_obj(request, post_list),
+        'page_obj': get_page_obj(
+            request, post_list, counters.group_scope(group.pk)
+        ),
     }
     return render(request, 'posts/group_list.html', context)
 
 
+@lookups.reject_missing(lookups.USERNAME, 'username')
+@conditional_page(etags.profile_validators, shared=True)
+@split_cache_page(etags.profile_page_key)
 def profile(request, username):
-    user_profile = get_object_or_404(User, username=username)
+    user_profile = lookups.get_or_404(
+        lookups.USERNAME, username, User.objects.filter(username=username)
+    )
     post_list = (
         Post.objects.select_related("author", "group")
         .filter(author=user_profile).all()
     )
-    following = False
-    if Follow.objects.filter(user=request.user).filter(author=user_profile):
-        following = Follow.objects.filter(user=request.user, author=user_profile).exists()
     context = {
         'user_profile': user_profile,
-        'page_obj': get_page_obj(request, post_list),
-        'following': following,
+        'page_obj': get_page_obj(
+            request, post_list, counters.author_scope(user_profile.pk)
+        ),
     }
     return render(request, 'posts/profile.html', context)
 
 
 @login_required
+@lookups.reject_missing(lookups.POST, 'post_id')
 def add_comment(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
     form = CommentForm(request.POST or None)
@@ -55,13 +70,23 @@ def add_comment(request, post_id):
     return redirect('posts:post_detail', post_id=post_id)
 
 
+@lookups.reject_missing(lookups.POST, 'post_id')
+@conditional_page(etags.post_detail_validators, shared=True)
+@split_cache_page(etags.post_detail_page_key)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = Post.objects.filter(pk=post_id).first()
+    is_archived = post is None
+    if is_archived:
+        # Пост нет ни среди живых, ни в архиве.
+        post = lookups.get_or_404(
+            lookups.POST, post_id, ArchivedPost.objects.filter(pk=post_id)
+        )
     form = CommentForm(request.POST or None)
     comments = post.comments.all()
     context = {'post': post,
                'form': form,
-               'comments': comments}
+               'comments': comments,
+               'is_archived': is_archived}
     return render(request, 'posts/post_detail.html', context)
 
 
@@ -74,10 +99,13 @@ def post_create(request):
     new_post = form.save(commit=False)
     new_post.author = request.user
     new_post.save()
+    if new_post.image:
+        enqueue('posts.build_image_variants', post_ids=[new_post.pk])
     return redirect('posts:profile', new_post.author)
 
 
 @login_required
+@lookups.reject_missing(lookups.POST, 'post_id')
 def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     if request.user != post.author:
@@ -85,31 +113,65 @@ def post_edit(request, post_id):
     form = PostForm(request.POST or None, files=request.FILES or None, instance=post)
     if form.is_valid():
         form.save()
+        if 'image' in form.changed_data and post.image:
+            enqueue('posts.build_image_variants', post_ids=[post.pk])
         return redirect('posts:post_detail', post_id)
     context = {'form': form, 'is_edit': True}
     return render(request, 'posts/create_post.html', context)
 
 
 @login_required
+@conditional_page(etags.follow_validators)
 def follow_index(request):
     post_list = Post.objects.filter(author__following__user=request.user)
     context = {
-        'page_obj': get_page_obj(request, post_list),
+        'page_obj': get_page_obj(
+            request, post_list, counters.follow_scope(request.user.pk)
+        ),
     }
     return render(request, 'posts/follow.html', context)
 
 
 @login_required
+@lookups.reject_missing(lookups.USERNAME, 'username')
 def profile_follow(request, username):
     if request.user.username != username:
-        author = get_object_or_404(User, username=username)
+        author = lookups.get_or_404(
+            lookups.USERNAME, username, User.objects.filter(username=username)
+        )
         Follow.objects.get_or_create(user=request.user, author=author)
+        counters.invalidate([counters.follow_scope(request.user.pk)])
     return redirect('posts:follow_index')
 
 
 @login_required
+@lookups.reject_missing(lookups.USERNAME, 'username')
 def profile_unfollow(request, username):
     if request.user.username != username:
-        author = get_object_or_404(User, username=username)
+        author = lookups.get_or_404(
+            lookups.USERNAME, username, User.objects.filter(username=username)
+        )
         Follow.objects.filter(user=request.user, author=author).delete()
+        counters.invalidate([counters.follow_scope(request.user.pk)])
     return redirect('posts:follow_index')
+
+
+@login_required
+@lookups.reject_missing(lookups.USERNAME, 'username')
+def profile_export(request, username):
+    author = lookups.get_or_404(
+        lookups.USERNAME, username, User.objects.filter(username=username)
+    )
+    if request.user != author and not request.user.is_staff:
+        raise Http404
+    export_format = request.GET.get('format', 'zip')
+    if export_format not in export.FORMATS:
+        raise Http404
+    response = StreamingHttpResponse(
+        export.export(author, export_format),
+        content_type=export.CONTENT_TYPES[export_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{export.filename(author, export_format)}"'
+    )
+    return response
@@ -3,3 +3,12 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from django.contrib.auth import password_validation
+
+        from . import signals  # noqa: F401
+
+        # Валидаторы паролей и список частых паролей загружаются при
+        # старте, а не на первой регистрации.
+        password_validation.get_default_password_validators()
@@ -0,0 +1,83 @@
+"""Снимок пользователя в кеше вместо запроса к auth_user.
+
+Стандартный AuthenticationMiddleware на каждый запрос читает строку
+пользователя из базы. Здесь в кеше лежит снимок из нескольких полей,
+которых хватает шапке и проверкам доступа, и хеш сессии для проверки
+после смены пароля. Пользователь собирается через from_db: остальные
+поля отложены и загрузятся из базы при первом обращении, а save()
+запишет только загруженные поля.
+
+Снимок сбрасывается при выходе, смене пароля и блокировке, и этот сброс
+должны увидеть все воркеры. Поэтому без общего кеша (core.cache) снимок
+не используется, и пользователь читается из базы, как обычно.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+from core.cache import is_shared
+
+SNAPSHOT_FIELDS = (
+    'id', 'username', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser',
+)
+
+
+def snapshot_key(user_id):
+    return f'user_snapshot:{user_id}'
+
+
+def snapshot(user):
+    data = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+    data['session_hash'] = user.get_session_auth_hash()
+    return data
+
+
+def from_snapshot(data):
+    model = auth.get_user_model()
+    # from_db ждёт значения в порядке полей модели.
+    fields = [
+        field.attname for field in model._meta.concrete_fields
+        if field.attname in SNAPSHOT_FIELDS
+    ]
+    return model.from_db(
+        'default', fields, [data[field] for field in fields]
+    )
+
+
+def invalidate(user_id):
+    cache.delete(snapshot_key(user_id))
+
+
+def get_user(request):
+    if not is_shared():
+        return auth.get_user(request)
+    try:
+        user_id = request.session[auth.SESSION_KEY]
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+    data = cache.get(snapshot_key(user_id))
+    if data is None:
+        # Обычный путь: загрузка из базы и проверка хеша сессии.
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(
+                snapshot_key(user_id), snapshot(user),
+                settings.USER_SNAPSHOT_TIMEOUT,
+            )
+        return user
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if not session_hash or not constant_time_compare(
+        session_hash, data['session_hash']
+    ):
+        # Пароль сменили в другой сессии - как и auth.get_user, выходим.
+        request.session.flush()
+        return AnonymousUser()
+    user = from_snapshot(data)
+    user.backend = backend_path
+    return user
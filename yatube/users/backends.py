@@ -0,0 +1,78 @@
+"""Проверка паролей в ограниченном пуле потоков.
+
+Вычисление хеша - самая дорогая часть входа. Пул из LOGIN_HASH_WORKERS
+потоков ограничивает число одновременных проверок, так что всплеск
+входов не занимает все ядра: лишние запросы ждут своей очереди. hashlib
+и argon2 отпускают GIL, поэтому проверки в пуле идут параллельно.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import (
+    check_password, get_hasher, identify_hasher, make_password,
+)
+from django.core.exceptions import PermissionDenied
+
+UserModel = get_user_model()
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'LOGIN_HASH_WORKERS', 4),
+            thread_name_prefix='password-hash',
+        )
+    return _executor
+
+
+def run_in_pool(func, *args):
+    return get_executor().submit(func, *args).result()
+
+
+def must_update(encoded):
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    preferred = get_hasher()
+    return (
+        hasher.algorithm != preferred.algorithm
+        or preferred.must_update(encoded)
+    )
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend, который считает хеши в пуле потоков.
+
+    В пуле выполняется только вычисление хеша, без обращений к базе.
+    Устаревший хеш (другой алгоритм или параметры) пересчитывается
+    после успешного входа. Неудача завершает authenticate() через
+    PermissionDenied, чтобы следующий в AUTHENTICATION_BACKENDS
+    ModelBackend не считал хеш второй раз.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Хеш считается и для несуществующего пользователя, чтобы
+            # время ответа не выдавало, есть ли такой логин.
+            run_in_pool(make_password, password)
+            raise PermissionDenied
+        if not run_in_pool(check_password, password, user.password):
+            raise PermissionDenied
+        if not self.user_can_authenticate(user):
+            raise PermissionDenied
+        if must_update(user.password):
+            user.password = run_in_pool(make_password, password)
+            user.save(update_fields=['password'])
+        return user
@@ -1,11 +1,59 @@
-from django.contrib.auth.forms import UserCreationForm
+from django import forms
+from django.conf import settings
+from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth import get_user_model
 
+from core import ratelimit
+
 
 User = get_user_model()
 
 
 class CreationForm(UserCreationForm):
+    # Уникальность логина проверяет validate_unique модели: это один
+    # точный запрос по уникальному индексу, и объединять его с другими
+    # проверками незачем. Поиск без учёта регистра индекс не использует
+    # и менял бы, какие логины допустимы.
     class Meta(UserCreationForm.Meta):
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+
+class ThrottledAuthenticationForm(AuthenticationForm):
+    """Форма входа с ограничением попыток по IP и по логину.
+
+    Лимиты проверяются до authenticate(), поэтому отклонённая попытка
+    не стоит вычисления хеша. С одного IP учитываются все попытки,
+    для логина - только неудачные; удачный вход сбрасывает счётчик логина.
+    Без общего кеша лимиты не действуют (core.ratelimit.enabled).
+    """
+    error_messages = {
+        **AuthenticationForm.error_messages,
+        'throttled': 'Слишком много попыток входа. Попробуйте позже.',
+    }
+
+    def clean(self):
+        if not ratelimit.enabled():
+            return super().clean()
+        limits = settings.LOGIN_RATE_LIMITS
+        ip_key = ratelimit.make_key(
+            'login-ip', ratelimit.client_ip(self.request)
+        )
+        username_key = ratelimit.make_key(
+            'login-username', (self.data.get('username') or '').lower()
+        )
+        if (
+            ratelimit.is_limited(ip_key, limits['ip'][0])
+            or ratelimit.is_limited(username_key, limits['username'][0])
+        ):
+            raise forms.ValidationError(
+                self.error_messages['throttled'], code='throttled'
+            )
+        ratelimit.hit(ip_key, limits['ip'][1])
+        try:
+            cleaned_data = super().clean()
+        except forms.ValidationError:
+            ratelimit.hit(username_key, limits['username'][1])
+            raise
+        ratelimit.reset(username_key)
+        return cleaned_data
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id с параметрами из настроек.
+
+    После изменения параметров старые хеши пересчитываются при входе:
+    must_update сравнивает параметры хеша с текущими.
+    """
+    time_cost = getattr(settings, 'ARGON2_TIME_COST', 2)
+    memory_cost = getattr(settings, 'ARGON2_MEMORY_COST', 19 * 1024)
+    parallelism = getattr(settings, 'ARGON2_PARALLELISM', 1)
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.mail import send_mail
+from django.template.loader import render_to_string
+
+from core.jobs import job
+from posts.models import Follow, User
+
+
+@job('users.send_welcome_email')
+def send_welcome_email(current, user_id):
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not user.email:
+        return
+    send_mail(
+        'Добро пожаловать в Yatube',
+        render_to_string('users/welcome_email.txt', {'user': user}),
+        None,
+        [user.email],
+    )
+
+
+@job('users.follow_default_authors')
+def follow_default_authors(current, user_id):
+    authors = User.objects.filter(
+        username__in=settings.SIGNUP_DEFAULT_FOLLOWS
+    ).exclude(pk=user_id).values_list('pk', flat=True)
+    Follow.objects.bulk_create(
+        (Follow(user_id=user_id, author_id=author) for author in authors),
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,61 @@
+import time
+
+from django.contrib.auth import password_validation
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from users.forms import CreationForm
+from users.views import SignUp
+
+BENCH_PASSWORD = 'bench-Signup-password-42'
+
+
+class Command(BaseCommand):
+    help = 'Замеряет пропускную способность регистрации'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--signups', type=int, default=50)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        password_validation.get_default_password_validators()
+        self.stdout.write(
+            f'загрузка валидаторов: '
+            f'{(time.perf_counter() - start) * 1000:.3f} мс'
+        )
+        signups = options['signups']
+        factory = RequestFactory()
+        view = SignUp.as_view()
+        validate = []
+        total = []
+        queries = 0
+        # Пользователи и задачи создаются в транзакции и откатываются;
+        # фоновые задачи только ставятся в очередь.
+        with override_settings(JOBS_ALWAYS_EAGER=False), \
+                transaction.atomic():
+            for i in range(signups):
+                data = {
+                    'username': f'bench-signup-{i}',
+                    'email': f'bench-signup-{i}@example.com',
+                    'password1': BENCH_PASSWORD,
+                    'password2': BENCH_PASSWORD,
+                }
+                start = time.perf_counter()
+                CreationForm(data).is_valid()
+                validate.append(time.perf_counter() - start)
+                request = factory.post('/auth/signup/', data)
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    view(request)
+                    total.append(time.perf_counter() - start)
+                queries += len(captured)
+            transaction.set_rollback(True)
+        elapsed = sum(total)
+        self.stdout.write(
+            f'регистраций: {signups}, в секунду: {signups / elapsed:.1f}\n'
+            f'валидация формы, мс: {sum(validate) / signups * 1000:.3f}\n'
+            f'запрос целиком, мс: {elapsed / signups * 1000:.3f}\n'
+            f'запросов к базе на регистрацию: {queries / signups:.1f}'
+        )
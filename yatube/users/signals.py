@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import auth
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User, dispatch_uid='users_snapshot_saved')
+@receiver(post_delete, sender=User, dispatch_uid='users_snapshot_deleted')
+def invalidate_snapshot(sender, instance, **kwargs):
+    # Смена пароля, блокировка или новое имя - снимок собирается заново.
+    auth.invalidate(instance.pk)
+
+
+@receiver(user_logged_out, dispatch_uid='users_snapshot_logged_out')
+def invalidate_snapshot_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        auth.invalidate(user.pk)
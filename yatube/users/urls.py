@@ -1,4 +1,4 @@
-from django.contrib.auth.views import LoginView, LogoutView, PasswordResetView
+from django.contrib.auth.views import LogoutView, PasswordResetView
 from django.urls import path
 
 from . import views
@@ -14,7 +14,7 @@ urlpatterns = [
     ),
     path(
         'login/',
-        LoginView.as_view(template_name='users/login.html'),
+        views.LoginView.as_view(),
         name='login'
     ),
     path(
@@ -0,0 +1,29 @@
+import gzip
+from functools import lru_cache
+
+from django.contrib.auth import password_validation
+
+
+@lru_cache(maxsize=None)
+def load_common_passwords(path):
+    try:
+        with gzip.open(path, 'rt') as file:
+            lines = file.read().splitlines()
+    except OSError:
+        with open(path) as file:
+            lines = file.read().splitlines()
+    return frozenset(line.strip() for line in lines)
+
+
+class CommonPasswordValidator(password_validation.CommonPasswordValidator):
+    """CommonPasswordValidator со списком, общим для всего процесса.
+
+    Список читается один раз на путь и хранится во frozenset; загрузка
+    выполняется при старте приложения (UsersConfig.ready), а не при
+    первой регистрации.
+    """
+
+    def __init__(self, password_list_path=(
+        password_validation.CommonPasswordValidator.DEFAULT_PASSWORD_LIST_PATH
+    )):
+        self.passwords = load_common_passwords(str(password_list_path))
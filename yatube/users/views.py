@@ -1,10 +1,34 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import views as auth_views
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
 
-from .forms import CreationForm
+from core.jobs import enqueue
+from .forms import CreationForm, ThrottledAuthenticationForm
 
 
 class SignUp(CreateView):
     form_class = CreationForm
     success_url = reverse_lazy('posts:index')
     template_name = 'users/signup.html'
+
+    def form_valid(self, form):
+        # Письмо и подписки не задерживают ответ на регистрацию.
+        response = super().form_valid(form)
+        enqueue('users.send_welcome_email', user_id=self.object.pk)
+        if settings.SIGNUP_DEFAULT_FOLLOWS:
+            enqueue('users.follow_default_authors', user_id=self.object.pk)
+        return response
+
+
+class LoginView(auth_views.LoginView):
+    authentication_form = ThrottledAuthenticationForm
+    template_name = 'users/login.html'
+
+    def form_invalid(self, form):
+        response = super().form_invalid(form)
+        if form.has_error('__all__', code='throttled'):
+            response.status_code = HTTPStatus.TOO_MANY_REQUESTS
+        return response
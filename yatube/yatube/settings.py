@@ -11,6 +11,8 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 """
 
 import os
+from importlib import import_module
+from importlib.util import find_spec
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -50,11 +52,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.LoadSheddingMiddleware',
+    'core.middleware.RateLimitMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -63,12 +67,22 @@ ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
+_template_loaders = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+# В продакшене шаблоны компилируются один раз на процесс
+if not DEBUG:
+    _template_loaders = [
+        ('django.template.loaders.cached.Loader', _template_loaders),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': _template_loaders,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -90,9 +104,21 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+    },
+    # Архив старых постов можно вынести в отдельный файл:
+    # 'archive': {
+    #     'ENGINE': 'django.db.backends.sqlite3',
+    #     'NAME': os.path.join(BASE_DIR, 'archive.sqlite3'),
+    # },
 }
 
+DATABASE_ROUTERS = ['posts.routers.ArchiveRouter']
+
+# Имя базы для архивных таблиц; None - архив в основной базе
+POSTS_ARCHIVE_DATABASE = None
+# Посты старше этого числа дней переносит в архив `manage.py archive_posts`
+POSTS_ARCHIVE_AFTER_DAYS = 365
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -105,13 +131,63 @@ AUTH_PASSWORD_VALIDATORS = [
         'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
     },
     {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+        'NAME': 'users.validators.CommonPasswordValidator',
     },
     {
         'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
     },
 ]
 
+# Argon2 используется, если установлен argon2-cffi; PBKDF2 и остальные
+# хешеры остаются для проверки старых паролей, которые пересчитываются
+# при входе (users.backends.PooledModelBackend).
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+if find_spec('argon2') is not None:
+    PASSWORD_HASHERS.insert(0, 'users.hashers.TunedArgon2PasswordHasher')
+# Параметры Argon2id: 2 прохода по 19 МиБ памяти в один поток
+ARGON2_TIME_COST = 2
+ARGON2_MEMORY_COST = 19 * 1024
+ARGON2_PARALLELISM = 1
+
+# ModelBackend остаётся в списке ради сессий, выданных до перехода на
+# PooledModelBackend: в них записан путь бэкенда, и без него все
+# пользователи разлогинились бы при выкладке. Пароль он повторно не
+# проверяет: PooledModelBackend сам завершает authenticate().
+AUTHENTICATION_BACKENDS = [
+    'users.backends.PooledModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+# Сколько паролей проверяется одновременно
+LOGIN_HASH_WORKERS = 4
+# Попыток входа (лимит, окно в секундах): с одного IP и неудачных для
+# логина. Считаются только в общем кеше (core.cache).
+LOGIN_RATE_LIMITS = {
+    'ip': (30, 60 * 5),
+    'username': (5, 60 * 15),
+}
+# Заголовок с адресом клиента от доверенного прокси (core.ratelimit),
+# например 'HTTP_X_REAL_IP' для proxy_set_header X-Real-IP $remote_addr
+# в nginx. Прокси должен перезаписывать заголовок, иначе клиент подставит
+# любой адрес. Без заголовка за прокси все запросы приходят с адреса
+# прокси и делят один лимит (предупреждение core.W002).
+RATELIMIT_IP_HEADER = None
+# Запросов с одного IP (core.middleware.RateLimitMiddleware): в секунду в
+# среднем и подряд без ожидания. None - без ограничения.
+RATELIMIT_RATE = 20
+RATELIMIT_BURST = 200
+# Сколько секунд помнить, что логина, слага или поста нет (posts.lookups)
+NEGATIVE_LOOKUP_TIMEOUT = 60 * 5
+
+
+# Логины авторов, на которых новый пользователь подписывается при
+# регистрации (фоновая задача users.follow_default_authors)
+SIGNUP_DEFAULT_FOLLOWS = []
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/2.2/topics/i18n/
@@ -134,23 +210,122 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 
 STATIC_URL = '/static/'
 
+# Каталог для collectstatic. В продакшене файлы получают хеш в имени
+# и сжатые копии .gz/.br, а отдаёт их core.static.StaticFilesApplication
+# из wsgi.py с заголовками кеша на год.
+STATIC_ROOT = os.path.join(BASE_DIR, 'static_root')
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Время кеширования файлов без хеша в имени, секунд
+STATIC_UNHASHED_MAX_AGE = 60 * 60
+
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
+# Заранее отрендеренные страницы (`manage.py prerender_pages`, core.prerender)
+PRERENDER_ROOT = os.path.join(BASE_DIR, 'prerendered')
+PRERENDER_MAX_AGE = 60 * 10
+
+# Сброс нагрузки (core.middleware): лимит одновременных запросов на
+# процесс и времени ожидания в очереди прокси, секунд. None - без лимита.
+LOAD_SHEDDING_MAX_IN_FLIGHT = 64
+LOAD_SHEDDING_MAX_QUEUE_TIME = 2.0
+LOAD_SHEDDING_QUEUE_HEADER = 'HTTP_X_REQUEST_START'
+LOAD_SHEDDING_RETRY_AFTER = 5
+
+# Прогрев воркера в wsgi.py (core.startup). С gunicorn --preload wsgi.py
+# импортирует мастер, и соединения с базой лучше не открывать; включайте
+# WARM_UP_DATABASE, только если воркеры импортируют wsgi.py сами.
+WARM_UP_ON_START = True
+WARM_UP_DATABASE = False
+
+# Общий кеш всех воркеров - memcached по адресу из окружения (нужен пакет
+# python-memcached). Без него LocMemCache у каждого процесса свой, и
+# механизмы, которым нужен общий кеш (core.cache), выключены.
+MEMCACHED_LOCATION = os.environ.get('MEMCACHED_LOCATION')
+if MEMCACHED_LOCATION:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': MEMCACHED_LOCATION,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# С общим кешем сессии читаются из него, база - только при промахе. На
+# кеше процесса выход из аккаунта не отзывал бы сессию в других
+# воркерах, поэтому без memcached сессии хранятся только в базе.
+# signed_cookies обходится без хранилища, но выход тогда не отзывает уже
+# выданную куку.
+SESSION_ENGINE = (
+    'django.contrib.sessions.backends.cached_db' if MEMCACHED_LOCATION
+    else 'django.contrib.sessions.backends.db'
+)
+# Снимок пользователя для шапки и проверок доступа (users.auth), секунд.
+# Используется только с общим кешем.
+USER_SNAPSHOT_TIMEOUT = 60 * 15
+
+# User.get_absolute_url ведёт на профиль автора. Модуль импортируется при
+# вызове: при чтении настроек приложения ещё не загружены.
+ABSOLUTE_URL_OVERRIDES = {
+    'auth.user': lambda user: (
+        import_module('core.urlbuilder').profile_url(user)
+    ),
+}
+
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
 
+# Письма ставятся в очередь (core.mail), а отправляет их команда
+# `manage.py send_outbox` через EMAIL_OUTBOX_BACKEND
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
 #  подключаем движок filebased.EmailBackend
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_OUTBOX_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 # указываем директорию, в которую будут складываться файлы писем
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+# Писем на одно соединение, число попыток и пауза перед первым повтором
+# (секунд, дальше удваивается)
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
-}
+# Варианты картинок постов в WebP/AVIF строит posts.images.
+THUMBNAIL_BACKEND = 'posts.thumbnail.ThumbnailBackend'
+THUMBNAIL_ENGINE = 'posts.thumbnail.Engine'
+# Потоков для кодирования вариантов в фоновой задаче
+POSTS_IMAGE_WORKERS = 4
+# Медиа отдаёт core.views.serve_media. 'x-accel' передаёт отдачу nginx
+# через internal-location MEDIA_ACCEL_PREFIX, смотрящий в MEDIA_ROOT,
+# 'x-sendfile' - Apache/lighttpd. None - файл отдаёт WSGI-сервер.
+MEDIA_SENDFILE = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_MAX_AGE = 60 * 60 * 24 * 30
+
+# Фоновые задачи: обработчик запускается командой `manage.py runjobs`.
+# В тестах задачи удобно выполнять сразу при постановке в очередь.
+JOBS_ALWAYS_EAGER = False
+JOBS_CHUNK_SIZE = 1000
+
+# Кеш счётчиков постов по областям ленты (posts.counters), секунд
+POSTS_COUNT_TIMEOUT = 60 * 60
+POSTS_FOLLOW_COUNT_TIMEOUT = 60
+
+# Общий кеш страниц с подстановкой личных фрагментов (core.fragments), секунд.
+# С EDGE_SIDE_INCLUDES фрагменты отдаются тегами <esi:include>, а страницы
+# кеширует CDN или обратный прокси с поддержкой ESI.
+SPLIT_CACHE_TIMEOUT = 60
+EDGE_SIDE_INCLUDES = False
+
+# Сколько строк JSON API читает из базы за раз при потоковой отдаче NDJSON
+API_STREAM_CHUNK_SIZE = 1000
+# Сколько строк читается из базы за раз при выгрузке профиля (posts.export)
+POSTS_EXPORT_CHUNK_SIZE = 2000
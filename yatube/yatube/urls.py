@@ -16,7 +16,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from core.views import serve_media
 
 handler404 = 'core.views.page_not_found'
 handler500 = 'core.views.server_error'
@@ -28,10 +29,12 @@ urlpatterns = [
     path('auth/', include('users.urls')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
+    path('fragments/', include('core.urls', namespace='core')),
+    path('api/v1/', include('posts.api_urls', namespace='api')),
+    path(
+        f'{settings.MEDIA_URL.lstrip("/")}<path:path>',
+        serve_media,
+        name='media',
+    ),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-    )
-
@@ -7,10 +7,27 @@ For more information on this file, see
 https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 """
 
+import logging
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+# Шаблоны, URL и соединения с базой готовятся до первого запроса.
+# Ошибка прогрева не должна мешать воркеру запуститься: всё это
+# сделает первый запрос.
+if settings.WARM_UP_ON_START:
+    from core.startup import warm_up
+    try:
+        warm_up()
+    except Exception:
+        logging.getLogger(__name__).exception('Прогрев не удался')
+
+# Собранную статику отдаём до Django, чтобы воркеры не тратились на неё.
+if not settings.DEBUG:
+    from core.static import StaticFilesApplication
+    application = StaticFilesApplication(application)